@@ -2,18 +2,26 @@
 
 import streamlit as st
 import os
-import tempfile
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple, cast
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
+from dataclasses import astuple
 from src.core.interview_system import InterviewSystem
-from src.core.models import InterviewConfig # Removed InterviewState if not directly used
+from src.core.models import InterviewConfig, InterviewState
 from src.database.supabase import SupabaseManager
+from src.components.document_processor import DocumentProcessor
 from dotenv import load_dotenv
 import markdown
 import json
+import orjson
 from gtts import gTTS
 import base64
 import io
+import copy
+import hashlib
+import html
+import time
+import uuid
 load_dotenv()
 
 # Page configuration (remains the same)
@@ -24,8 +32,8 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS (remains the same)
-st.markdown("""
+# Custom CSS. Streamlit drops elements that are not re-rendered, so this must be emitted on every run
+_CSS = """
 <style>
     .main-header { background: linear-gradient(90deg, #667eea 0%, #764ba2 100%); padding: 2rem; border-radius: 10px; margin-bottom: 2rem; color: white; text-align: center; }
     [data-testid="stForm"] {
@@ -45,82 +53,223 @@ st.markdown("""
     .score-display { background: #e8f5e8; padding: 0.5rem 1rem; border-radius: 20px; display: inline-block; font-weight: bold; color: #2e7d32; }
     .user-info { background: linear-gradient(90deg, #667eea 0%, #764ba2 100%); padding: 1rem; border-radius: 8px; margin-bottom: 1rem; }
     .stButton > button { width: 100%; background: linear-gradient(90deg, #667eea 0%, #764ba2 100%); color: white; border: none; border-radius: 8px; padding: 0.5rem 1rem; font-weight: bold; }
+    [data-testid="stChatMessage"] { background: #f8f9fa; border-radius: 8px; margin: 0.5rem 0; }
+    .dashboard-metrics { display: flex; gap: 1rem; }
+    .dashboard-metrics .dashboard-metric { flex: 1; }
     .dashboard-metric { background: white; padding: 1rem; border-radius: 8px; border: 1px solid #e9ecef; margin: 0.5rem 0; text-align: center; color: green; }
     .report-viewer { background: #ffffff; padding: 1.5rem; border-radius: 8px; border: 1px solid #dee2e6; margin-top: 1rem; color: black;}
     .report-viewer h4 { color: #4a4a4a; margin-top: 1rem; margin-bottom: 0.5rem; }
     .report-viewer pre { background-color: #f1f1f1; padding: 10px; border-radius: 4px; white-space: pre-wrap; word-wrap: break-word; }
     .completion-report-display { margin-top: 1.5rem; padding: 1.5rem; background-color: #f9f9f9; border-radius: 8px; }
 </style>
-""", unsafe_allow_html=True)
+"""
+st.markdown(_CSS, unsafe_allow_html=True)
+
+_METRIC_ROW_TEMPLATE = (
+    '<div class="dashboard-metrics">'
+    '<div class="dashboard-metric"><h3>{total_sessions}</h3><p>Total Sessions</p></div>'
+    '<div class="dashboard-metric"><h3>{completed_sessions}</h3><p>Completed</p></div>'
+    '<div class="dashboard-metric"><h3>{overall_avg_score}</h3><p>Average Score</p></div>'
+    '<div class="dashboard-metric"><h3>{total_questions_answered}</h3><p>Questions Answered</p></div>'
+    '</div>'
+)
+_METRIC_DEFAULTS = {'total_sessions': 0, 'completed_sessions': 0, 'overall_avg_score': 0, 'total_questions_answered': 0}
+
+MAX_CACHED_QUESTION_AUDIO = 256
+
+def _synthesize_question_audio(question: str) -> str:
+    """Synthesize speech for a question and return it as base64-encoded MP3"""
+    tts = gTTS(text=question, lang='en')
+    audio_fp = io.BytesIO()
+    tts.write_to_fp(audio_fp)
+    audio_fp.seek(0)
+    return base64.b64encode(audio_fp.read()).decode()
+
+@st.cache_resource
+def _audio_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=2)
+
+@st.cache_resource
+def _question_audio_futures() -> Dict[str, Future]:
+    """Question text -> pending or finished speech synthesis, shared across sessions"""
+    return {}
+
+def prefetch_question_audio(question: str) -> Future:
+    """Start synthesizing a question's audio in the background if it isn't already cached"""
+    futures = _question_audio_futures()
+    future = futures.get(question)
+    if future is None:
+        if len(futures) >= MAX_CACHED_QUESTION_AUDIO:
+            futures.pop(next(iter(futures)), None)
+        future = futures[question] = _audio_executor().submit(_synthesize_question_audio, question)
+    return future
 
 def generate_question_audio(question: str) -> str:
     try:
-        tts = gTTS(text=question, lang='en')
-        audio_fp = io.BytesIO()
-        tts.write_to_fp(audio_fp)
-        audio_fp.seek(0)
-        audio_bytes = audio_fp.read()
-        audio_base64 = base64.b64encode(audio_bytes).decode()
+        audio_base64 = prefetch_question_audio(question).result()
         audio_html = f'<audio autoplay><source src="data:audio/mp3;base64,{audio_base64}" type="audio/mpeg"></audio>'
         return audio_html
     except Exception as e:
+        _question_audio_futures().pop(question, None)
         st.warning(f"Could not generate audio: {e}")
         return ""
 
-# --- Helper function to display a report (used on completion and dashboard) ---
-def display_report_details_component(report_details: Dict[str, Any]):
-    """Helper function to render report details within a styled div."""
-    if not report_details:
-        st.error("Report data is not available.")
-        return 
+def _short(value: Any, n: int) -> str:
+    """Truncate a value for display without re-stringifying values that are already str"""
+    if value is None:
+        return ''
+    return value[:n] if isinstance(value, str) else str(value)[:n]
+
+def _fmt_block(label: str, value: Any) -> str:
+    """Labelled <pre> block for a report field that may be JSON (dict/list) or plain text"""
+    if not value:
+        return ''
+    if isinstance(value, str):
+        body = html.escape(value)
+    elif isinstance(value, (dict, list)):
+        body = html.escape(json.dumps(value, indent=2, default=str))
+    else:
+        body = html.escape(str(value))
+    return f"<h4>{label}:</h4><pre>{body}</pre>"
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _build_report_html(report_details: Dict[str, Any], report_content: str) -> Tuple[str, Optional[str]]:
+    """Assemble the report viewer HTML; repeat views of the same report reuse the result.
+
+    Also returns the Markdown error when the content fell back to plain text, so the caller
+    (which isn't cached) can show the warning on every view.
+    """
+    markdown_error = None
     html_parts = ['<div class="report-viewer">']
 
     html_parts.append(f"<h3>📄 Report: {report_details.get('title', 'Untitled Report')}</h3>")
-    html_parts.append(f"<p><small>Generated on: {str(report_details.get('created_at', 'N/A'))[:16]}</small></p>")
+    html_parts.append(f"<p><small>Generated on: {_short(report_details.get('created_at', 'N/A'), 16)}</small></p>")
     if report_details.get('session_id'):
         html_parts.append(f"<p><small>Associated Session ID: {report_details.get('session_id')}</small></p>")
 
-    if report_details.get('summary'):
-        html_parts.append("<h4>Summary:</h4>")
-        summary_data = report_details['summary']
-        if isinstance(summary_data, (dict, list)):
-            summary_str = json.dumps(summary_data, indent=2)
-            html_parts.append(f"<pre>{summary_str}</pre>")
-        else:
-            import html
-            html_parts.append(f"<pre>{html.escape(str(summary_data))}</pre>")
-    
-    if report_details.get('scores'):
-        html_parts.append("<h4>Scores:</h4>")
-        scores_data = report_details['scores']
-        if isinstance(scores_data, (dict, list)):
-            scores_str = json.dumps(scores_data, indent=2)
-            html_parts.append(f"<pre>{scores_str}</pre>")
-        else:
-            import html
-            html_parts.append(f"<pre>{html.escape(str(scores_data))}</pre>")
+    html_parts.append(_fmt_block("Summary", report_details.get('summary')))
+    html_parts.append(_fmt_block("Scores", report_details.get('scores')))
 
     if report_details.get('recommendations'):
-        html_parts.append("<h4>Recommendations:</h4>")
-        import html
-        html_parts.append(f"<p>{html.escape(str(report_details['recommendations']))}</p>")
+        html_parts.append(f"<h4>Recommendations:</h4><p>{html.escape(str(report_details['recommendations']))}</p>")
     
-    if report_details.get('report_content'):
+    if report_content:
         html_parts.append("<h4>Full Report Content:</h4>")
         try:
-            html_report_content = markdown.markdown(str(report_details['report_content']))
-            html_parts.append(html_report_content)
+            html_parts.append(markdown.markdown(str(report_content)))
         except Exception as e:
-            import html #
-            st.warning(f"Note: Could not render full report content as rich Markdown, displaying as plain text. Error: {e}") #
-            html_parts.append(f"<pre>{html.escape(str(report_details['report_content']))}</pre>") #
+            markdown_error = str(e)
+            html_parts.append(f"<pre>{html.escape(str(report_content))}</pre>") #
 
     html_parts.append('</div>') 
-    
-    final_html = "".join(html_parts)
-    st.markdown(final_html, unsafe_allow_html=True)
+    return "".join(html_parts), markdown_error
+
+# --- Helper function to display a report (used on completion and dashboard) ---
+def display_report_details_component(report_details: Dict[str, Any]):
+    """Helper function to render report details within a styled div."""
+    if not report_details:
+        st.error("Report data is not available.")
+        return 
+    # The body lives in Storage (or an unselected column), so it is only fetched when a report is shown
+    report_content = report_details.get('report_content') or _cached_report_content(
+        report_details.get('user_id'), report_details.get('id'), report_details.get('content_path'),
+        st.session_state.supabase_manager
+    )
+    report_html, markdown_error = _build_report_html(report_details, report_content)
+    if markdown_error:
+        st.warning(f"Note: Could not render full report content as rich Markdown, displaying as plain text. Error: {markdown_error}") #
+    st.markdown(report_html, unsafe_allow_html=True)
+
+@st.cache_resource
+def _user_cache_versions() -> Dict[Tuple[str, str], int]:
+    """Per-user generation counters, shared by every session of the server process"""
+    return {}
+
+def _cache_version(user_id: str, scope: str = 'data') -> int:
+    return _user_cache_versions().get((user_id, scope), 0)
+
+def _invalidate_user_cache(user_id: str, scope: str = 'data'):
+    """Drop one user's cached reads without touching anybody else's.
+
+    The version is part of each cached reader's key, so bumping it makes that user's next read
+    miss; entries under the old version just age out through the cache's ttl.
+    """
+    versions = _user_cache_versions()
+    versions[(user_id, scope)] = versions.get((user_id, scope), 0) + 1
+
+# The cached readers below take the calling session's SupabaseManager (unhashed, hence the
+# leading underscore) so each query runs with that user's auth; results are keyed by user.
+# Saved reports never change, so they are held as shared objects (cache_resource) rather than
+# unpickled into a fresh copy on every rerun; callers must treat them as read-only.
+
+@st.cache_resource(ttl=600, max_entries=128, show_spinner=False)
+def _cached_report(user_id: str, version: int, report_id: str, _manager: SupabaseManager) -> Optional[Dict[str, Any]]:
+    return _manager.get_report(report_id)
+
+@st.cache_resource(ttl=600, max_entries=128, show_spinner=False)
+def _cached_report_content(user_id: Optional[str], report_id: Optional[str], content_path: Optional[str],
+                           _manager: SupabaseManager) -> str:
+    """Full report body; saved reports are immutable so this can be cached for a while"""
+    if not report_id and not content_path:
+        return ''
+    return _manager.get_report_content({'id': report_id, 'content_path': content_path})
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _cached_user_settings(user_id: str, version: int, _manager: SupabaseManager) -> Dict[str, Any]:
+    """User settings; read by the sidebar on every rerun but only changed from the settings form"""
+    return _manager.get_user_settings(user_id) or {}
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_user_data(user_id: str, version: int, _manager: SupabaseManager) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Fetch dashboard stats and reports concurrently; they are independent queries"""
+    manager = _manager
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        stats_future = executor.submit(manager.get_user_dashboard_stats, user_id)
+        reports_future = executor.submit(manager.get_user_reports_full, user_id, REPORTS_PAGE_SIZE)
+        stats, reports = stats_future.result(), reports_future.result()
+
+    # Format display dates once per fetch rather than on every dashboard rerun
+    for row in (*stats.get('sessions', []), *reports):
+        row['created_date'] = _short(row.get('created_at', 'N/A'), 10)
+    return stats, reports
+
+REPORTS_PAGE_SIZE = 50
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_reports_page(user_id: str, version: int, offset: int, _manager: SupabaseManager) -> List[Dict[str, Any]]:
+    """A later page of the report list; the first page comes with _cached_user_data"""
+    reports = _manager.get_user_reports_full(user_id, REPORTS_PAGE_SIZE, offset)
+    for row in reports:
+        row['created_date'] = _short(row.get('created_at', 'N/A'), 10)
+    return reports
+
+_SS_DEFAULTS: Dict[str, Any] = {
+    'user': None,
+    'interview_system': None,
+    'interview_state': {},
+    'current_session_id': None,
+    'interview_started': False,
+    'current_question': "",
+    'current_question_idx': 0,
+    'conversation_history': [],
+    'interview_complete': False,
+    'files_uploaded': False,
+    'auth_mode': 'signin',
+    'last_generated_report_id': None,
+    'score_sum': 0,
+    'score_count': 0,
+}
+
+# Keys that survive "Start New Interview"; everything else is per-interview and is
+# re-seeded from _SS_DEFAULTS on the next run. The uploaded documents stay for the next interview.
+_KEYS_KEPT_ON_NEW_INTERVIEW = frozenset([
+    'user', 'supabase_manager', 'session_token', 'interview_system', '_auth_checked', 'auth_mode',
+    'max_questions_setting', 'model_name_setting', 'resume_upload', 'job_desc_upload',
+])
 
 def initialize_session_state():
+    # Each session gets its own client: Supabase auth state lives on the client, so sharing
+    # one across sessions would let one user's sign-in act for everybody else
     if 'supabase_manager' not in st.session_state:
         try:
             st.session_state.supabase_manager = SupabaseManager()
@@ -128,30 +277,34 @@ def initialize_session_state():
             st.error(f"❌ Critical Error: Could not initialize Supabase Manager. {e}")
             st.stop() 
     
-    if 'user' not in st.session_state: st.session_state.user = None
-    if 'interview_system' not in st.session_state: st.session_state.interview_system = None
-    if 'interview_state' not in st.session_state: st.session_state.interview_state = {} 
-    if 'current_session_id' not in st.session_state: st.session_state.current_session_id = None
-    if 'interview_started' not in st.session_state: st.session_state.interview_started = False
-    if 'current_question' not in st.session_state: st.session_state.current_question = ""
-    if 'current_question_idx' not in st.session_state: st.session_state.current_question_idx = 0 # Add this line
-    if 'conversation_history' not in st.session_state: st.session_state.conversation_history = []
-    if 'interview_complete' not in st.session_state: st.session_state.interview_complete = False
-    if 'files_uploaded' not in st.session_state: st.session_state.files_uploaded = False
-    if 'auth_mode' not in st.session_state: st.session_state.auth_mode = 'signin'
-    if 'selected_report_id_to_display' not in st.session_state: st.session_state.selected_report_id_to_display = None
-    if 'last_generated_report_id' not in st.session_state: st.session_state.last_generated_report_id = None
+    # Identifies this browser session in process-wide caches that must not be shared between tabs
+    if 'session_token' not in st.session_state:
+        st.session_state.session_token = uuid.uuid4().hex
+    
+    for key, default in _SS_DEFAULTS.items():
+        # Copy so mutable defaults (lists/dicts) are never shared between sessions
+        st.session_state.setdefault(key, copy.copy(default))
+
+MODELS = ("gpt-4o-mini", "gpt-4o", "gpt-3.5-turbo")
+MODEL_INDEX = {name: idx for idx, name in enumerate(MODELS)}
 
 def check_authentication(): #
-    if not st.session_state.user:
-        try:
-            user_response = st.session_state.supabase_manager.get_current_user()
-            if user_response and user_response.user:
-                st.session_state.user = user_response.user
-                return True
-        except:
-            pass # Fail silently
-    return st.session_state.user is not None
+    if st.session_state.user:
+        return True
+    
+    # Only ask Supabase for the current user once per session; sign-in sets the user directly
+    if st.session_state.get('_auth_checked'):
+        return False
+    st.session_state._auth_checked = True
+    
+    try:
+        user_response = st.session_state.supabase_manager.get_current_user()
+        if user_response and user_response.user:
+            st.session_state.user = user_response.user
+            return True
+    except:
+        pass # Fail silently
+    return False
 
 def show_auth_page():
     st.markdown("""
@@ -218,30 +371,92 @@ def show_auth_page():
                             st.error(f"❌ Error: {result.get('error', 'Unknown signin error')}")
 
 
+@st.fragment
+def _reports_fragment(user_reports: List[Dict[str, Any]]):
+    """Report picker and viewer; selecting a report reruns only this section"""
+    # Only the first page comes in with the dashboard data; "Load more" pulls further pages
+    pages_loaded = st.session_state.get('dashboard_report_pages', 1)
+    last_page = user_reports
+    for page in range(1, pages_loaded):
+        last_page = _cached_reports_page(st.session_state.user.id, _cache_version(st.session_state.user.id),
+                                         page * REPORTS_PAGE_SIZE, st.session_state.supabase_manager)
+        user_reports = [*user_reports, *last_page]
+
+    # Keyed by str(id) so lookups match the string values held in st.query_params
+    reports_by_id = {str(report.get('id')): report for report in user_reports}
+
+    # The selection lives in the URL so reloads and shared links reopen the same report,
+    # even one that is older than the pages loaded so far
+    report_id = st.query_params.get('report')
+    if report_id is not None and report_id not in reports_by_id:
+        linked_report = _cached_report(st.session_state.user.id, _cache_version(st.session_state.user.id), report_id,
+                                       st.session_state.supabase_manager)
+        if linked_report:
+            reports_by_id[report_id] = linked_report
+        else:
+            del st.query_params['report']
+            report_id = None
+    report_ids = list(reports_by_id)
+
+    def _report_label(report_id):
+        report = reports_by_id[report_id]
+        created_date = report.get('created_date') or _short(report.get('created_at', ''), 10)
+        return f"{report.get('title', 'Untitled Report')} ({created_date})"
+
+    selected_report_id = st.selectbox(
+        "Select a report to view:", 
+        options=report_ids, 
+        index=report_ids.index(report_id) if report_id else None,
+        placeholder="Choose a report...",
+        format_func=_report_label,
+        key="dashboard_report_selectbox"
+    )
+
+    # A full last page means there may be more to fetch
+    if len(last_page) == REPORTS_PAGE_SIZE and st.button("Load more reports", key="load_more_reports"):
+        st.session_state.dashboard_report_pages = pages_loaded + 1
+        st.rerun(scope="fragment")
+
+    if selected_report_id and selected_report_id != report_id:
+        st.query_params['report'] = selected_report_id
+        report_id = selected_report_id
+
+    if report_id:
+        # Reports were fetched in full above, so no extra round-trip is needed here
+        report_details_data = reports_by_id[report_id]
+        display_report_details_component(report_details_data)
+
+        st.markdown("---")
+        if st.button("🗑️ Delete This Report from Dashboard", key=f"delete_dashboard_report_{report_id}", type="primary"): #
+            with st.spinner("Deleting report..."):
+                if st.session_state.supabase_manager.delete_report(report_details_data.get('id')):
+                    _invalidate_user_cache(st.session_state.user.id)
+                    st.success("Report deleted successfully!")
+                    del st.query_params['report']
+                    st.rerun()
+                else:
+                    st.error("Failed to delete report.")
+
 def show_user_dashboard(): #
     if not st.session_state.user:
         st.warning("User not found. Please sign in again.")
         return
 
     user_id = st.session_state.user.id
-    stats = st.session_state.supabase_manager.get_user_dashboard_stats(user_id)
+    stats, user_reports = _cached_user_data(user_id, _cache_version(user_id), st.session_state.supabase_manager)
 
     st.markdown("### 📊 Your Interview Dashboard")
-    col1, col2, col3, col4 = st.columns(4) #
-    with col1: st.markdown(f"""<div class="dashboard-metric"><h3>{stats.get('total_sessions', 0)}</h3><p>Total Sessions</p></div>""", unsafe_allow_html=True) #
-    with col2: st.markdown(f"""<div class="dashboard-metric"><h3>{stats.get('completed_sessions', 0)}</h3><p>Completed</p></div>""", unsafe_allow_html=True) #
-    with col3: st.markdown(f"""<div class="dashboard-metric"><h3>{stats.get('overall_avg_score', 0)}</h3><p>Average Score</p></div>""", unsafe_allow_html=True) #
-    with col4: st.markdown(f"""<div class="dashboard-metric"><h3>{stats.get('total_questions_answered', 0)}</h3><p>Questions Answered</p></div>""", unsafe_allow_html=True) #
+    st.markdown(_METRIC_ROW_TEMPLATE.format_map({**_METRIC_DEFAULTS, **stats}), unsafe_allow_html=True)
 
     st.markdown("---")
     st.markdown("### 📝 Recent Interview Sessions")
     if stats.get('sessions'): #
         for session in stats['sessions']: #
             if isinstance(session, dict):
-                session_id_disp = str(session.get('id', 'N/A'))[:8]
+                session_id_disp = _short(session.get('id', 'N/A'), 8)
                 session_status_disp = str(session.get('status', 'N/A')).title() #
                 session_title_disp = session.get('title', 'Untitled Session')
-                session_created_disp = str(session.get('created_at', 'N/A'))[:10]
+                session_created_disp = session.get('created_date', 'N/A')
                 
                 expander_title = f"{session_title_disp} (ID: {session_id_disp}...) - {session_status_disp} on {session_created_disp}"
                 with st.expander(expander_title):
@@ -265,51 +480,66 @@ def show_user_dashboard(): #
 
     st.markdown("---")
     st.markdown("### 📜 Your Interview Reports") #
-    user_reports = st.session_state.supabase_manager.get_user_reports(user_id) #
 
     if not user_reports:
         st.info("You have no saved interview reports yet.") #
     else:
-        report_options = {
-            f"{idx + 1}. {report.get('title', 'Untitled Report')} ({str(report.get('created_at', ''))[:10]})": report.get('id') 
-            for idx, report in enumerate(user_reports)
-        }
-        
-        selected_report_label = st.selectbox(
-            "Select a report to view:", 
-            options=list(report_options.keys()), 
-            index=None,
-            placeholder="Choose a report...",
-            key="dashboard_report_selectbox"
-        )
+        _reports_fragment(user_reports)
 
-        if selected_report_label:
-            st.session_state.selected_report_id_to_display = report_options[selected_report_label] #
+@st.cache_data(max_entries=64, ttl=3600, show_spinner=False)
+def _extract_upload_text(sha256: str, name: str, _data: bytes) -> str:
+    """Text of an uploaded document, parsed once per content hash; held in memory only, never written to disk"""
+    return DocumentProcessor.extract_text(_data, name)
 
-        if st.session_state.selected_report_id_to_display:
-            report_id = st.session_state.selected_report_id_to_display
-            # Display report details using the helper function
-            with st.spinner("Loading report details..."): #
-                report_details_data = st.session_state.supabase_manager.get_report(report_id) #
-            
-            if report_details_data:
-                display_report_details_component(report_details_data)
-                
-                st.markdown("---")
-                if st.button("🗑️ Delete This Report from Dashboard", key=f"delete_dashboard_report_{report_id}", type="primary"): #
-                    with st.spinner("Deleting report..."):
-                        if st.session_state.supabase_manager.delete_report(report_id):
-                            st.success("Report deleted successfully!")
-                            st.session_state.selected_report_id_to_display = None 
-                            st.rerun()
-                        else:
-                            st.error("Failed to delete report.")
-            else:
-                st.error(f"Could not load details for report ID: {report_id}")
-                st.session_state.selected_report_id_to_display = None
+def _upload_text(uploaded_file) -> str:
+    data = uploaded_file.getvalue()
+    return _extract_upload_text(hashlib.sha256(data).hexdigest(), uploaded_file.name, data)
+
+@st.cache_resource(show_spinner=False, max_entries=32, ttl=3600)
+def _get_interview_system(api_key: str, session_token: str, config_values: Tuple) -> InterviewSystem:
+    """Build an InterviewSystem once per browser session and configuration, reusing its LLM and embedding clients.
+    
+    Keyed by session rather than user: each interview points the system's RAG index at its own
+    documents, so two tabs must never share one.
+    """
+    return InterviewSystem(api_key, InterviewConfig(*config_values))
+
+def _report_title(session_id: Optional[str], user_email: str) -> str:
+    """Title for a saved report, derived from the session it belongs to"""
+    today = datetime.now().strftime('%Y-%m-%d')
+    if session_id:
+        return f"Report for Session ({_short(session_id, 8)}) - {today}"
+    return f"Interview Report for {user_email} on {today}"
+
+def _interview_history_hash(state: Dict[str, Any]) -> str:
+    """Stable digest of everything the final report is derived from"""
+    payload = orjson.dumps(
+        [state.get('resume_content', ''), state.get('job_description', ''), state.get('interview_plan', []),
+         state.get('conversation_history', []), state.get('interview_notes', [])],
+        option=orjson.OPT_SORT_KEYS, default=str
+    )
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+def _final_report_state(state: InterviewState) -> Dict[str, Any]:
+    """Generate the final report once per interview history; reruns reuse the result kept in session state.
+    
+    Kept per session rather than in st.cache_data, so one user's report can never be served to another.
+    """
+    history_hash = _interview_history_hash(state)
+    cached = st.session_state.get('final_report_cache')
+    if cached and cached[0] == history_hash:
+        return cached[1]
+    final_state = st.session_state.interview_system.generate_final_report(state)
+    st.session_state.final_report_cache = (history_hash, final_state)
+    return final_state
+
+@st.cache_resource(show_spinner=False)
+def _openai_api_key() -> Optional[str]:
+    """OPENAI_API_KEY, read from the environment once per server process rather than on every rerun"""
+    return os.getenv("OPENAI_API_KEY")
 
 def setup_interview_system() -> Optional[InterviewSystem]:
-    api_key = os.getenv("OPENAI_API_KEY")
+    api_key = _openai_api_key()
     if not api_key:
         st.error("❌ Please set OPENAI_API_KEY environment variable.")
         return None
@@ -317,7 +547,8 @@ def setup_interview_system() -> Optional[InterviewSystem]:
     try:
         user_settings: Dict[str, Any] = {} 
         if st.session_state.user and hasattr(st.session_state.user, 'id'):
-             user_settings = st.session_state.supabase_manager.get_user_settings(st.session_state.user.id) or {} 
+             user_settings = _cached_user_settings(st.session_state.user.id, _cache_version(st.session_state.user.id, 'settings'),
+                                                   st.session_state.supabase_manager)
         
         config = InterviewConfig(
             max_questions=st.session_state.max_questions_slider,
@@ -328,23 +559,20 @@ def setup_interview_system() -> Optional[InterviewSystem]:
             model_name=st.session_state.model_choice_selectbox,
             index_path="./vector_stores/interview_faiss_index" 
         )
-        return InterviewSystem(api_key, config)
+        return _get_interview_system(api_key, st.session_state.session_token, astuple(config))
     except Exception as e:
         st.error(f"❌ Error initializing interview system: {e}")
         return None
     
-def save_uploaded_file(uploaded_file, file_type: str) -> str:
-    temp_dir = tempfile.mkdtemp()
-    file_name = getattr(uploaded_file, 'name', 'unknown_file')
-    file_path = os.path.join(temp_dir, f"{file_type}_{file_name}")
-    with open(file_path, "wb") as f: f.write(uploaded_file.getbuffer())
-    return file_path
-
-def save_session_to_supabase():
-    if not st.session_state.get('interview_state') or not st.session_state.user: return
-    user_id = st.session_state.user.id
+def _average_score() -> Optional[float]:
+    """Average of the scores recorded so far, kept as a running sum/count in session state"""
+    if not st.session_state.get('score_count'):
+        return None
+    return st.session_state.score_sum / st.session_state.score_count
+
+def _build_session_payload() -> Dict[str, Any]:
+    """Snapshot the current interview into the interview_sessions row shape"""
     state = st.session_state.interview_state
-    
     # Safely get current_question_idx for the default title
     current_q_idx_for_title = st.session_state.get('current_question_idx', 0)
 
@@ -362,23 +590,138 @@ def save_session_to_supabase():
         'final_report': state.get('interview_report', '')
     }
 
-    notes = session_data['interview_notes'] 
-    if isinstance(notes, list) and notes:
-        scores = [note.get('score', 0) for note in notes if isinstance(note, dict)]
-        if scores: session_data['average_score'] = round(sum(scores) / len(scores), 1)
-    
+    avg_score = _average_score()
+    if avg_score is not None: session_data['average_score'] = round(avg_score, 1)
+    return session_data
+
+def _session_payload_hash(session_data: Dict[str, Any]) -> bytes:
+    """Digest of a session payload, used to skip writes that would change nothing"""
+    return hashlib.blake2b(
+        orjson.dumps(session_data, option=orjson.OPT_SORT_KEYS, default=str), digest_size=16
+    ).digest()
+
+def _settle_turn_save():
+    """Wait for the previous background session save.
+
+    Called before the next write so session writes never overlap or land out of order.
+    """
+    future = st.session_state.pop('pending_turn_save', None)
+    if future is None:
+        return
+    if future.result():
+        _invalidate_user_cache(st.session_state.user.id)
+    else:
+        # Each write carries the whole row, so forgetting the saved hash makes the next save retry it
+        st.session_state.last_save_hash = None
+        st.toast("⚠️ Could not save your last answer; it will be retried with the next one.", icon="⚠️")
+
+def _submit_turn_save(session_id: str, session_data: Dict[str, Any]):
+    """Write the session row in the background so the next question shows straight away"""
+    _settle_turn_save()
+    st.session_state.pending_turn_save = _save_executor().submit(
+        st.session_state.supabase_manager.update_interview_session, session_id, session_data
+    )
+    st.session_state.last_turn_save_at = time.monotonic()
+
+# Mid-interview turns are written at most this often; the turns in between go out together
+# with the next write, and the end of the interview always writes everything
+SESSION_SAVE_INTERVAL_S = 15.0
+
+def save_session_to_supabase(force: bool = False):
+    if not st.session_state.get('interview_state') or not st.session_state.user: return
+    user_id = st.session_state.user.id
+
+    session_data = _build_session_payload()
+
+    # Skip the write when the row would end up identical to what was last saved
+    save_hash = _session_payload_hash(session_data)
+    if not force and save_hash == st.session_state.get('last_save_hash'):
+        return
+    # Coalesce: every write carries the whole row, so a deferred save loses nothing
+    if (not force and st.session_state.current_session_id
+            and time.monotonic() - st.session_state.get('last_turn_save_at', 0.0) < SESSION_SAVE_INTERVAL_S):
+        return
+
     try:
         if st.session_state.current_session_id:
-            success = st.session_state.supabase_manager.update_interview_session(st.session_state.current_session_id, session_data) #
-            if success: st.toast("✅ Session updated.", icon="👍")
+            _submit_turn_save(st.session_state.current_session_id, session_data)
         else:
             session_id = st.session_state.supabase_manager.create_interview_session(user_id, session_data) #
             if session_id:
                 st.session_state.current_session_id = session_id
                 st.toast("✅ Session saved.", icon="💾")
+        st.session_state.last_save_hash = save_hash
+        _invalidate_user_cache(user_id)
     except Exception as e:
         st.error(f"❌ Error saving session state: {e}")
 
+@st.cache_resource
+def _save_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=4)
+
+def _hydrate_saved_report(state: Dict[str, Any]) -> bool:
+    """Reuse a report already generated for this session instead of calling the LLM again.
+
+    Returns True when the session's report was found in the database and loaded into state.
+    """
+    session_id = st.session_state.get('current_session_id')
+    # A session already found to have no report is not looked up again on every rerun
+    if not session_id or st.session_state.get('report_missing_for_session') == session_id:
+        return False
+    stored = st.session_state.supabase_manager.get_session_report_status(session_id)
+    if not stored or not stored.get('report_generated_at') or not stored.get('report_id'):
+        st.session_state.report_missing_for_session = session_id
+        return False
+    state['interview_report'] = stored.get('final_report', '')
+    st.session_state.last_generated_report_id = stored['report_id']
+    return True
+
+@st.fragment(run_every=1)
+def _report_save_status():
+    """Poll the background report save and pick up its result once it lands.
+
+    Only rendered while a save is pending; the full rerun that follows the result drops the
+    fragment, and with it the timer.
+    """
+    future = st.session_state.get('pending_report_save')
+    if future is None:
+        st.rerun()  # A timer left over from a finished save: rerun the app so the fragment is dropped
+    if not future.done():
+        st.status("💾 Saving your report...", state="running")
+        return
+
+    del st.session_state.pending_report_save
+    saved = future.result()
+    saved_report_id = saved.get('report_id') if saved else None
+    if saved_report_id:
+        st.session_state.current_session_id = saved.get('session_id')
+        st.session_state.last_save_hash = _session_payload_hash(_build_session_payload())
+        _invalidate_user_cache(st.session_state.user.id)
+        st.session_state.last_generated_report_id = saved_report_id
+        st.toast(f"📝 Report saved (ID: {saved_report_id[:8]})!", icon="📄")
+    else:
+        save_session_to_supabase(force=True)  # Keep the session even if the report failed
+        st.session_state.report_save_failed = True
+    st.rerun()
+
+@st.fragment
+def _completion_report_fragment():
+    """Full report on the completion screen; interactions inside it rerun only this block"""
+    report_to_display_id = st.session_state.get('last_generated_report_id')
+    if report_to_display_id:
+        with st.spinner("Loading your report..."):
+            report_details_data = _cached_report(st.session_state.user.id, _cache_version(st.session_state.user.id),
+                                                         report_to_display_id, st.session_state.supabase_manager)
+        if report_details_data:
+            st.markdown("### Your Generated Interview Report")
+            display_report_details_component(report_details_data)
+        else:
+            st.error("Could not retrieve the generated report for display.")
+    elif st.session_state.get('pending_report_save'):
+        st.info("Your report is still being saved and will appear here shortly.")
+    else:
+        st.info("Report already generated. You can find it in the dashboard or start a new interview.")
+
 def display_interview_progress(): #
     if st.session_state.interview_state and isinstance(st.session_state.interview_state, dict): #
         current_idx = st.session_state.interview_state.get('current_question_idx', 0) #
@@ -390,38 +733,98 @@ def display_interview_progress(): #
             st.progress(progress) #
             st.write(f"Question {current_idx} of {total_questions}") #
             
-            interview_notes = st.session_state.interview_state.get('interview_notes', []) #
-            if isinstance(interview_notes, list) and interview_notes: #
-                scores = [note.get('score', 0) for note in interview_notes if isinstance(note, dict)] #
-                if scores: #
-                    avg_score = sum(scores) / len(scores) #
-                    st.markdown(f'<div class="score-display">Average Score: {avg_score:.1f}/10</div>', unsafe_allow_html=True) #
+            avg_score = _average_score()
+            if avg_score is not None: #
+                st.markdown(f'<div class="score-display">Average Score: {avg_score:.1f}/10</div>', unsafe_allow_html=True) #
+
+RECENT_TURNS_SHOWN = 10
+
+def _render_exchange(exchange: Dict[str, Any]):
+    with st.chat_message("assistant", avatar="🤖"):
+        st.text(exchange.get("question", "N/A"))
+    with st.chat_message("user", avatar="👤"):
+        # Candidate text is shown as typed, never interpreted as markdown
+        st.text(exchange.get("response", "N/A"))
+        if 'score' in exchange:
+            st.caption(f"Score: {exchange.get('score', 0)}/10")
 
 def display_conversation_history():
     if st.session_state.conversation_history and isinstance(st.session_state.conversation_history, list):
         st.subheader("📝 Interview Conversation")
         
-        for i, exchange in enumerate(st.session_state.conversation_history):
+        exchanges = []
+        for exchange in st.session_state.conversation_history:
             if isinstance(exchange, dict):
-                with st.container():
-                    st.markdown(f"""
-                    <div class="question-box">
-                        <strong>🤖 Interviewer:</strong>
-                        <p style="font-size: 1.1em; margin-bottom: 0;">{exchange.get('question', 'N/A')}</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    st.markdown(f"""
-                    <div class="response-box">
-                        <strong>👤 You:</strong>
-                        <p style="font-size: 1.1em; margin-bottom: 0;">{exchange.get('response', 'N/A')}</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    if 'score' in exchange:
-                        st.markdown(f'<div class="score-display">Score: {exchange.get("score", 0)}/10</div>', unsafe_allow_html=True)
-                    st.markdown("---")
+                exchanges.append(exchange)
             else:
                 st.warning(f"Skipping malformed conversation entry: {exchange}")
 
+        # Long histories keep older turns collapsed
+        older, recent = exchanges[:-RECENT_TURNS_SHOWN], exchanges[-RECENT_TURNS_SHOWN:]
+        if older:
+            with st.expander(f"Earlier questions ({len(older)})"):
+                for exchange in older:
+                    _render_exchange(exchange)
+        for exchange in recent:
+            _render_exchange(exchange)
+
+@st.fragment
+def _interview_fragment():
+    """Question/answer section; reruns on its own when the answer form is submitted"""
+    display_interview_progress() #
+    if st.session_state.interview_state: #
+        question = st.session_state.interview_system.get_next_question(st.session_state.interview_state) #
+        if question: #
+            st.session_state.current_question = question
+            audio_html = generate_question_audio(question)
+            # Warm up the next question's audio while the candidate is answering
+            interview_plan = st.session_state.interview_state.get('interview_plan', [])
+            next_idx = st.session_state.interview_state.get('current_question_idx', 0) + 1
+            if next_idx < len(interview_plan):
+                prefetch_question_audio(interview_plan[next_idx]['question'])
+            st.markdown(f"""
+                <div class="question-box">
+                    <h4>🤖 Interviewer Question:</h4>
+                    <p style="font-size: 1.1em; margin-bottom: 0;">{question}</p>
+                </div>
+                {audio_html}
+            """, unsafe_allow_html=True)
+            with st.form(key="response_form", clear_on_submit=True): #
+                candidate_response = st.text_area("Your Answer:", height=150, placeholder="Type your response here...", key="candidate_input") #
+                form_col1, _, form_col3 = st.columns([1,1,1]) #
+                with form_col1: submit_response = st.form_submit_button("📤 Submit Answer") #
+                with form_col3: end_interview = st.form_submit_button("⏹️ End Interview") #
+
+            if submit_response and candidate_response.strip(): #
+                try:
+                    # Stream the analysis as feedback; the interview state is updated in place
+                    st.write_stream(st.session_state.interview_system.process_candidate_answer_stream(
+                        st.session_state.interview_state, candidate_response
+                    )) #
+                    latest_note = st.session_state.interview_state.get('interview_notes', [])[-1] if st.session_state.interview_state.get('interview_notes') else None #
+                    latest_score = latest_note.get('score', 0) if latest_note else 0
+                    st.session_state.conversation_history.append({ #
+                        'question': st.session_state.current_question, #
+                        'response': candidate_response, #
+                        'score': latest_score #
+                    })
+                    st.session_state.score_sum += latest_score
+                    st.session_state.score_count += 1
+                    st.success(f"✅ Response recorded! Score: {latest_score}/10") #
+                    save_session_to_supabase() #
+                    st.rerun(scope="fragment") # Next question only needs this section redrawn
+                except Exception as e:
+                    st.error(f"❌ Error processing response: {e}") #
+
+            if end_interview: #
+                st.session_state.interview_complete = True #
+                save_session_to_supabase(force=True) # Flush any coalesced turns
+                st.rerun() #
+        else: # No more questions
+            st.session_state.interview_complete = True #
+            save_session_to_supabase(force=True) # Flush any coalesced turns
+            st.rerun() #
+
 def main():
     initialize_session_state()
     if not check_authentication():
@@ -436,25 +839,36 @@ def main():
         if st.button("🚪 Sign Out", use_container_width=True, key="signout_button"):  #
             if hasattr(st.session_state, 'supabase_manager') and st.session_state.supabase_manager: #
                 st.session_state.supabase_manager.sign_out() #
-            keys_to_clear = list(st.session_state.keys()) #
-            for key in keys_to_clear: #
-                if key not in ['supabase_manager', 'auth_mode']: 
-                    del st.session_state[key] #
+            # Wipe everything in one go so nothing from this user leaks into the next sign-in
+            preserved = {k: st.session_state[k] for k in ('supabase_manager',) if k in st.session_state}
+            st.session_state.clear()
+            st.session_state.update(preserved)
             st.session_state.auth_mode = 'signin' 
+            st.query_params.clear()
             st.rerun() #
 
         st.markdown("---") #
         st.header("⚙️ Configuration") #
-        user_s = st.session_state.supabase_manager.get_user_settings(st.session_state.user.id) if st.session_state.user and hasattr(st.session_state.user, 'id') else {} #
-        max_q = st.slider("Max Questions", 3, 15, user_s.get('max_questions',5), key="max_questions_slider") #
-        models = ["gpt-4o-mini", "gpt-4o", "gpt-3.5-turbo"] #
-        current_model_idx = models.index(user_s.get('model_name', 'gpt-4o-mini')) if user_s.get('model_name', 'gpt-4o-mini') in models else 0 #
-        model_c = st.selectbox("AI Model", models, index=current_model_idx, key="model_choice_selectbox") #
+        user_s = _cached_user_settings(st.session_state.user.id, _cache_version(st.session_state.user.id, 'settings'),
+                                       st.session_state.supabase_manager) if st.session_state.user and hasattr(st.session_state.user, 'id') else {} #
+        # Batched in a form so adjusting a setting doesn't rerun the app until it is saved
+        with st.form("config_form", border=False):
+            # Unsaved choices carried over from the previous interview win over the saved settings
+            default_max_q = st.session_state.get('max_questions_setting', user_s.get('max_questions', 5))
+            default_model = st.session_state.get('model_name_setting', user_s.get('model_name', 'gpt-4o-mini'))
+            max_q = st.slider("Max Questions", 3, 15, default_max_q, key="max_questions_slider") #
+            current_model_idx = MODEL_INDEX.get(default_model, 0) #
+            model_c = st.selectbox("AI Model", MODELS, index=current_model_idx, key="model_choice_selectbox") #
+            save_settings = st.form_submit_button("💾 Save Settings", use_container_width=True)
+        # Mirrored under plain keys: widget keys can't be written back after a session state clear
+        st.session_state.max_questions_setting = max_q
+        st.session_state.model_name_setting = model_c
 
-        if st.button("💾 Save Settings", use_container_width=True, key="save_settings_button"): #
+        if save_settings: #
             if st.session_state.user and hasattr(st.session_state.user, 'id'): #
                 settings_to_save = {'max_questions': max_q, 'model_name': model_c} #
                 if st.session_state.supabase_manager.update_user_settings(st.session_state.user.id, settings_to_save): #
+                    _invalidate_user_cache(st.session_state.user.id, 'settings')
                     st.success("Settings saved!") #
                 else: st.error("Error saving settings.") #
             else: st.warning("User not found. Cannot save settings.") #
@@ -493,6 +907,10 @@ def main():
                     if st.button("🚀 Start Interview", key="start_interview_main_button", use_container_width=True): #
                         st.session_state.current_session_id = None
                         st.session_state.last_generated_report_id = None 
+                        st.session_state.last_save_hash = None
+                        st.session_state.pop('pending_turn_save', None)
+                        st.session_state.score_sum = 0
+                        st.session_state.score_count = 0
                         st.session_state.conversation_history = [] 
                         st.session_state.interview_state = {}
                         st.session_state.current_question_idx = 0
@@ -512,9 +930,12 @@ def main():
 
                         with st.spinner("📋 Preparing your personalized interview..."): #
                             try:
-                                resume_path = save_uploaded_file(resume_file, "resume") #
-                                job_desc_path = save_uploaded_file(job_desc_file, "job_desc") #
-                                st.session_state.interview_state = st.session_state.interview_system.start_interactive_interview(resume_path, job_desc_path) #
+                                st.session_state.interview_state = st.session_state.interview_system.start_interactive_interview_from_text(
+                                    _upload_text(resume_file), resume_file.name,
+                                    _upload_text(job_desc_file), job_desc_file.name,
+                                    # Synthesize the opening question while the rest of the plan streams in
+                                    on_first_question=lambda q: prefetch_question_audio(q['question'])
+                                ) #
                                 st.session_state.interview_started = True #
                                 st.rerun() #
                             except Exception as e:
@@ -522,6 +943,7 @@ def main():
                                 # return # Consider if you want to stop or allow retry
             
             if st.session_state.get('interview_started') and not st.session_state.interview_system:
+                 # setup_interview_system returns this session's cached system when it is still cached
                  with st.spinner("🔧 Re-initializing AI Interview System..."):
                     st.session_state.interview_system = setup_interview_system()
                  if not st.session_state.interview_system:
@@ -530,96 +952,55 @@ def main():
                     st.rerun()
 
             if st.session_state.get('interview_started') and not st.session_state.get('interview_complete'): #
-                display_interview_progress() #
-                save_session_to_supabase() 
-                if st.session_state.interview_state: #
-                    question = st.session_state.interview_system.get_next_question(st.session_state.interview_state) #
-                    if question: #
-                        st.session_state.current_question = question
-                        audio_html = generate_question_audio(question)
-                        st.markdown(f"""
-                            <div class="question-box">
-                                <h4>🤖 Interviewer Question:</h4>
-                                <p style="font-size: 1.1em; margin-bottom: 0;">{question}</p>
-                            </div>
-                            {audio_html}
-                        """, unsafe_allow_html=True)
-                        with st.form(key="response_form", clear_on_submit=True): #
-                            candidate_response = st.text_area("Your Answer:", height=150, placeholder="Type your response here...", key="candidate_input") #
-                            form_col1, _, form_col3 = st.columns([1,1,1]) #
-                            with form_col1: submit_response = st.form_submit_button("📤 Submit Answer") #
-                            with form_col3: end_interview = st.form_submit_button("⏹️ End Interview") #
-                        
-                        if submit_response and candidate_response.strip(): #
-                            with st.spinner("🔍 Analyzing your response..."): #
-                                try:
-                                    st.session_state.interview_state = st.session_state.interview_system.process_candidate_answer(st.session_state.interview_state, candidate_response) #
-                                    latest_note = st.session_state.interview_state.get('interview_notes', [])[-1] if st.session_state.interview_state.get('interview_notes') else None #
-                                    st.session_state.conversation_history.append({ #
-                                        'question': st.session_state.current_question, #
-                                        'response': candidate_response, #
-                                        'score': latest_note.get('score', 0) if latest_note else 0 #
-                                    })
-                                    st.success(f"✅ Response recorded! Score: {latest_note.get('score', 0) if latest_note else 0}/10") #
-                                    save_session_to_supabase() #
-                                    st.rerun() #
-                                except Exception as e:
-                                    st.error(f"❌ Error processing response: {e}") #
-                        
-                        if end_interview: #
-                            st.session_state.interview_complete = True #
-                            save_session_to_supabase() #
-                            st.rerun() #
-                    else: # No more questions
-                        st.session_state.interview_complete = True #
-                        save_session_to_supabase() #
-                        st.rerun() #
+                _interview_fragment()
 
             if st.session_state.get('interview_complete'):
                 st.balloons()
                 st.markdown("""<div class="main-header"><h2>🎉 Interview Completed!</h2><p>Great job! Here are your results and feedback.</p></div>""", unsafe_allow_html=True)
 
-                current_interview_state = st.session_state.get('interview_state', {})
-                report_generated_this_run = False
+                # interview_state is always a dict here (seeded by _SS_DEFAULTS, replaced by the interview system)
+                current_interview_state = cast(InterviewState, st.session_state.interview_state)
 
                 # Generate and save report if not already done or if last_generated_report_id is not set
-                if isinstance(current_interview_state, dict) and not st.session_state.get('last_generated_report_id'):
-                    with st.spinner("📊 Generating and saving your comprehensive interview report..."):
-                        final_state = st.session_state.interview_system.generate_final_report(current_interview_state)
+                if (not st.session_state.get('last_generated_report_id')
+                        and not st.session_state.get('pending_report_save') and not st.session_state.get('report_save_failed')
+                        and not _hydrate_saved_report(current_interview_state)):
+                    with st.spinner("📊 Generating your comprehensive interview report..."):
+                        final_state = _final_report_state(current_interview_state)
                         st.session_state.interview_state = final_state
                         
-                        save_session_to_supabase()  # Save updated session state with report string
-
                         if st.session_state.user and hasattr(st.session_state.user, 'id'):
                             report_content_str = final_state.get('interview_report', '')
                             if report_content_str:
-                                report_title = f"Interview Report for {user_email} on {datetime.now().strftime('%Y-%m-%d')}"
-                                if st.session_state.current_session_id:
-                                    report_title = f"Report for Session ({str(st.session_state.current_session_id)[:8]}) - {datetime.now().strftime('%Y-%m-%d')}"
-                                
                                 report_data_for_db = {
-                                    'title': report_title,
+                                    'title': _report_title(st.session_state.current_session_id, user_email),
                                     'report_content': report_content_str,
                                     'summary': final_state.get('report_summary_json', {}),
                                     'scores': final_state.get('report_scores_json', {}),
                                     'recommendations': final_state.get('report_recommendations_text', '')
                                 }
-                                saved_report_id = st.session_state.supabase_manager.save_interview_report(
+                                # Session update and report insert go out as one transactional RPC,
+                                # off the script thread so the results render straight away.
+                                # Any in-flight turn save lands first so it can't overwrite the final row.
+                                _settle_turn_save()
+                                st.session_state.pending_report_save = _save_executor().submit(
+                                    st.session_state.supabase_manager.save_session_and_report,
                                     user_id=st.session_state.user.id,
                                     session_id=st.session_state.current_session_id,
+                                    session_data=_build_session_payload(),
                                     report_data=report_data_for_db
                                 )
-                                if saved_report_id:
-                                    st.session_state.last_generated_report_id = saved_report_id
-                                    report_generated_this_run = True
-                                    st.toast(f"📝 Report saved (ID: {saved_report_id[:8]})!", icon="📄")
-                                else:
-                                    st.error("Failed to save the detailed interview report to the database.")
                             else:
+                                save_session_to_supabase(force=True)
                                 st.warning("Report content was empty, not saving to dedicated reports table.")
                         else:
                             st.warning("User information not found. Cannot save report.")
 
+                if st.session_state.get('pending_report_save'):
+                    _report_save_status()
+                elif st.session_state.get('report_save_failed'):
+                    st.error("Failed to save the detailed interview report to the database.")
+
                 # Display results in tabs
                 result_tab1, result_tab2, result_tab3 = st.tabs(["📊 Summary", "💬 Conversation", "📋 Full Report"])
 
@@ -658,34 +1039,18 @@ def main():
                     display_conversation_history()
 
                 with result_tab3:
-                    report_to_display_id = st.session_state.get('last_generated_report_id')
-                    if report_to_display_id:
-                        with st.spinner("Loading your report..."):
-                            report_details_data = st.session_state.supabase_manager.get_report(report_to_display_id)
-                        if report_details_data:
-                            st.markdown("### Your Generated Interview Report")
-                            display_report_details_component(report_details_data)
-                        else:
-                            st.error("Could not retrieve the generated report for display.")
-                    elif not report_generated_this_run:
-                        st.info("Report already generated. You can find it in the dashboard or start a new interview.")
+                    _completion_report_fragment()
 
                 # New Interview button
                 st.markdown("---")
                 _, btn_col, _ = st.columns([1,2,1])
                 with btn_col:
                     if st.button("🔄 Start New Interview", key="start_new_interview_button_main", use_container_width=True):
-                        keys_to_reset = [
-                            'interview_state', 'interview_started', 'current_question',
-                            'conversation_history', 'interview_complete', 'current_session_id',
-                            'files_uploaded', 'resume_upload', 'job_desc_upload',
-                            'selected_report_id_to_display', 'files_uploaded_message_shown',
-                            'last_generated_report_id'
-                        ]
-                        for key in keys_to_reset:
-                            if key in st.session_state:
-                                del st.session_state[key]
-                        st.session_state.files_uploaded = False
+                        # Deleted rather than cleared and restored: file_uploader values can't be set back
+                        for key in st.session_state.keys() - _KEYS_KEPT_ON_NEW_INTERVIEW:
+                            del st.session_state[key]
+                        if st.session_state.get('user'):
+                            _invalidate_user_cache(st.session_state.user.id)
                         st.rerun()
 
     with tab2:
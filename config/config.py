@@ -1,11 +1,12 @@
 import os
-import json
+import functools
+import orjson
 from typing import Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, replace
 from src.core.models import InterviewConfig
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SystemConfig:
     """Extended system configuration"""
     # Core settings
@@ -32,35 +33,50 @@ class SystemConfig:
     batch_size: int = 10
 
 
+@functools.lru_cache(maxsize=4)
+def _load_config_cached(path: str, mtime: float) -> SystemConfig:
+    """Parse a config file; keyed on its mtime so an edited file is read again"""
+    with open(path, 'rb') as f:
+        config_dict = orjson.loads(f.read())
+    
+    # Convert nested dicts back to dataclasses
+    interview_config = InterviewConfig(**config_dict.get('interview', {}))
+    
+    config_dict['interview'] = interview_config
+    config = SystemConfig(**config_dict)
+    
+    print(f"✅ Configuration loaded from {path}")
+    return config
+
+
 class ConfigManager:
     """Manages configuration loading, saving, and validation"""
     
     def __init__(self, config_path: str = "./config.json"):
         self.config_path = config_path
         self._config: Optional[SystemConfig] = None
+        # Set whenever _config differs from what was last written to disk
+        self._dirty = True
+        self._serialized: Optional[bytes] = None
     
     def load_config(self) -> SystemConfig:
         """Load configuration from file or create default"""
         if os.path.exists(self.config_path):
             try:
-                with open(self.config_path, 'r') as f:
-                    config_dict = json.load(f)
-                
-                # Convert nested dicts back to dataclasses
-                interview_config = InterviewConfig(**config_dict.get('interview', {}))
-                
-                config_dict['interview'] = interview_config
-                self._config = SystemConfig(**config_dict)
-                
-                print(f"✅ Configuration loaded from {self.config_path}")
+                # Re-parsed only when the file has changed since the last load
+                mtime = os.path.getmtime(self.config_path)
+                self._config = _load_config_cached(self.config_path, mtime)
+                self._dirty = False
                 
             except Exception as e:
                 print(f"⚠️ Error loading config: {e}")
                 print("Using default configuration")
                 self._config = self._get_default_config()
+                self._dirty = True
         else:
             print("No config file found, creating default configuration")
             self._config = self._get_default_config()
+            self._dirty = True
             self.save_config()
         
         return self._config
@@ -69,13 +85,21 @@ class ConfigManager:
         """Save current configuration to file"""
         if not self._config:
             self._config = self._get_default_config()
+            self._dirty = True
+        
+        # Nothing has changed since the file was last loaded or written
+        if not self._dirty and os.path.exists(self.config_path):
+            return
         
         try:
             # Convert dataclasses to dict for JSON serialization
-            config_dict = asdict(self._config)
+            if self._dirty or self._serialized is None:
+                self._serialized = orjson.dumps(asdict(self._config), option=orjson.OPT_INDENT_2)
             os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
-            with open(self.config_path, 'w') as f:
-                json.dump(config_dict, f, indent=2)
+            with open(self.config_path, 'wb') as f:
+                f.write(self._serialized)
+            _load_config_cached.cache_clear()
+            self._dirty = False
             
             print(f"✅ Configuration saved to {self.config_path}")
             
@@ -93,12 +117,19 @@ class ConfigManager:
         if not self._config:
             self._config = self.load_config()
         
+        changes = {}
         for key, value in kwargs.items():
             if hasattr(self._config, key):
-                setattr(self._config, key, value)
+                if getattr(self._config, key) != value:
+                    changes[key] = value
             else:
                 print(f"⚠️ Unknown config parameter: {key}")
         
+        # Configs are frozen (and may be shared via the load cache), so swap in a new one
+        if changes:
+            self._config = replace(self._config, **changes)
+            self._dirty = True
+        
         self.save_config()
     
     def _get_default_config(self) -> SystemConfig:
@@ -180,6 +211,7 @@ class ConfigManager:
         print(f"  Resume: {config.default_resume_path}")
         print(f"  Job Description: {config.default_job_desc_path}")
         print(f"  FAISS Index: {config.interview.index_path}")
+        print(f"  FAISS Index Type: {config.interview.index_type}")
         
         print("\n📂 Output Directories:")
         print(f"  Reports: {config.reports_dir}")
@@ -1,3 +1,7 @@
+import asyncio
+import os
+import sys
+import threading
 from src.core.interview_system import InterviewSystem
 from src.core.models import InterviewConfig
 from src.utils.utils import save_interview_session, export_report_to_file, print_interview_summary
@@ -15,30 +19,14 @@ def interactive_interview_mode(interview_system: InterviewSystem, resume_path: s
     state = interview_system.start_interactive_interview(resume_path, job_desc_path)
     
     # Interactive Q&A loop
-    while state['current_question_idx'] < len(state['interview_plan']):
-        # Get next question
-        question = interview_system.get_next_question(state)
-        
-        if not question:
-            break
-            
-        # Ask the question
-        print(f"\nInterviewer: {question}")
-        
-        # Get candidate response
-        candidate_answer = input("Candidate: ")
-        
-        if candidate_answer.lower() in ['quit', 'exit', 'stop']:
-            print("Interview terminated by user.")
-            break
-        
-        # Process the answer
-        state = interview_system.process_candidate_answer(state, candidate_answer)
-        
-        print(f"[Note taken - Score: {state['interview_notes'][-1]['score']}/10]")
-    
-    # Generate final report
-    state = interview_system.generate_final_report(state)
+    try:
+        state = asyncio.run(_run_interview_rounds(interview_system, state))
+    except KeyboardInterrupt:
+        # The input thread is still blocked reading stdin: it would swallow the next menu choice,
+        # and holds the stdin lock a normal interpreter shutdown waits on
+        print("\n\nInterview interrupted by user.")
+        sys.stdout.flush()
+        os._exit(130)
     
     # Print summary
     print_interview_summary(state)
@@ -46,7 +34,11 @@ def interactive_interview_mode(interview_system: InterviewSystem, resume_path: s
     print("\n" + "="*50)
     print("FINAL INTERVIEW REPORT")
     print("="*50)
-    print(state['interview_report'])
+    
+    # Generate the final report, printing it as it streams in
+    for chunk in interview_system.generate_final_report_stream(state):
+        print(chunk, end="", flush=True)
+    print()
     
     # Save session and report
     try:
@@ -57,10 +49,72 @@ def interactive_interview_mode(interview_system: InterviewSystem, resume_path: s
     except Exception as e:
         print(f"⚠️ Warning: Could not save files: {e}")
 
+async def _ainput(prompt: str) -> str:
+    """input() on a daemon thread, so an interrupted interview can exit without waiting for it"""
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    
+    def settle(setter, value):
+        if not future.done():
+            setter(value)
+    
+    def read():
+        try:
+            outcome = (future.set_result, input(prompt))
+        except Exception as e:
+            outcome = (future.set_exception, e)
+        try:
+            loop.call_soon_threadsafe(settle, *outcome)
+        except RuntimeError:
+            pass  # the loop has already closed
+    
+    threading.Thread(target=read, daemon=True).start()
+    return await future
+
+async def _run_interview_rounds(interview_system: InterviewSystem, state):
+    """Ask the planned questions, analyzing each answer while the candidate reads and answers the next.
+    
+    The next question comes straight from the plan, so it is shown at once; the previous
+    answer's analysis only has to be finished before the new answer is processed.
+    """
+    plan = state['interview_plan']
+    pending = None
+    
+    try:
+        for idx in range(state['current_question_idx'], len(plan)):
+            # Ask the question
+            print(f"\nInterviewer: {plan[idx]['question']}")
+            
+            # Get candidate response
+            candidate_answer = await _ainput("Candidate: ")
+            
+            if pending is not None:
+                state = await pending
+                pending = None
+                print(f"[Note taken - Score: {state['interview_notes'][-1]['score']}/10]")
+            
+            if candidate_answer.lower() in ['quit', 'exit', 'stop']:
+                print("Interview terminated by user.")
+                break
+            
+            # Process the answer in the background
+            if not interview_system.get_next_question(state):
+                break
+            pending = asyncio.create_task(interview_system.aprocess_candidate_answer(state, candidate_answer))
+        
+        if pending is not None:
+            state = await pending
+            pending = None
+            print(f"[Note taken - Score: {state['interview_notes'][-1]['score']}/10]")
+    finally:
+        # Interrupted mid-answer: drop the analysis still running in the background
+        if pending is not None:
+            pending.cancel()
+    
+    return state
+
 def main():
     """Main application entry point"""
-    import os
-    
     # Configuration - now properly using max_questions
     config = InterviewConfig(
         max_questions=5,  # This will now be used by the planner
@@ -1,40 +1,75 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict
+import fitz
 from langchain.schema import Document
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.document_loaders import PyPDFLoader, TextLoader
+from langchain_community.document_loaders import TextLoader
+
+# Chunk boundaries, most preferred first: the recursive splitter's defaults (paragraph, line,
+# word, then single characters as a last resort)
+_SEPARATORS = ("\n\n", "\n", " ", "")
+_SEP_RES = {sep: re.compile(f"({re.escape(sep)})") for sep in _SEPARATORS if sep}
 
 
 class DocumentProcessor:
     """Handles document loading and processing operations"""
     
     def __init__(self, chunk_size: int = 500, chunk_overlap: int = 50):
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap
-        )
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
     
     def load_documents(self, resume_path: str, job_desc_path: str) -> List[Document]:
         """Load resume and job description documents"""
-        documents = []
-        
         try:
-            # Load resume
-            if resume_path.endswith('.pdf'):
-                resume_loader = PyPDFLoader(resume_path)
-                resume_docs = resume_loader.load()
-            else:
-                resume_loader = TextLoader(resume_path, encoding='utf-8')
-                resume_docs = resume_loader.load()
-            
-            # Load job description
-            job_loader = TextLoader(job_desc_path, encoding='utf-8')
-            job_docs = job_loader.load()
+            # The two files are independent: parse the resume while the job description is read
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                resume_future = executor.submit(self._load_one, resume_path, 'resume')
+                job_future = executor.submit(self._load_one, job_desc_path, 'job_description')
+                resume_docs, job_docs = resume_future.result(), job_future.result()
             
         except FileNotFoundError as e:
             raise FileNotFoundError(f"Could not find file: {e}")
         except Exception as e:
             raise Exception(f"Error loading documents: {e}")
         
+        return resume_docs + job_docs
+    
+    def _load_one(self, path: str, source_type: str) -> List[Document]:
+        """Load a single file and tag its documents with their source type"""
+        if path.endswith('.pdf'):
+            with fitz.open(path) as pdf:
+                docs = [
+                    Document(page_content=page.get_text("text"), metadata={'source': path, 'page': i})
+                    for i, page in enumerate(pdf)
+                ]
+        else:
+            docs = TextLoader(path, encoding='utf-8').load()
+        for doc in docs:
+            doc.metadata['source_type'] = source_type
+        return docs
+    
+    @staticmethod
+    def extract_text(data: bytes, name: str) -> str:
+        """Extract the plain text of an uploaded file; PDF pages are joined with newlines"""
+        try:
+            if name.endswith('.pdf'):
+                with fitz.open(stream=data, filetype="pdf") as pdf:
+                    return '\n'.join(page.get_text("text") for page in pdf)
+            return data.decode('utf-8')
+        except Exception as e:
+            raise Exception(f"Error loading documents: {e}")
+    
+    def load_documents_from_text(self, resume_text: str, resume_name: str,
+                                 job_desc_text: str, job_desc_name: str) -> List[Document]:
+        """Build resume and job description documents from already extracted text"""
+        resume_docs = [Document(page_content=resume_text, metadata={'source': resume_name})]
+        job_docs = [Document(page_content=job_desc_text, metadata={'source': job_desc_name})]
+        return self._tag_documents(resume_docs, job_docs)
+    
+    def _tag_documents(self, resume_docs: List[Document], job_docs: List[Document]) -> List[Document]:
+        """Add source type metadata and combine resume and job description documents"""
+        documents = []
+        
         # Add metadata
         for doc in resume_docs:
             doc.metadata['source_type'] = 'resume'
@@ -48,14 +83,80 @@ class DocumentProcessor:
     
     def split_documents(self, documents: List[Document]) -> List[Document]:
         """Split documents into chunks"""
-        return self.text_splitter.split_documents(documents)
+        return [
+            Document(page_content=chunk, metadata=dict(doc.metadata))
+            for doc in documents
+            for chunk in self._fast_split(doc.page_content, self.chunk_size, self.chunk_overlap)
+        ]
+    
+    @staticmethod
+    def _fast_split(text: str, size: int, overlap: int) -> List[str]:
+        """Split text into chunks of at most size characters, with the same boundaries as
+        RecursiveCharacterTextSplitter's defaults but without its per-document overhead.
+        
+        Text is split on the most preferred separator it contains; pieces that are still too
+        long are split again on the next one, and adjacent pieces are packed back together.
+        """
+        chunks: List[str] = []
+        DocumentProcessor._split_level(text, 0, size, overlap, chunks)
+        return chunks
+    
+    @staticmethod
+    def _split_level(text: str, level: int, size: int, overlap: int, chunks: List[str]) -> None:
+        # The first separator present in the text; the empty one always matches
+        level = next(i for i in range(level, len(_SEPARATORS)) if _SEPARATORS[i] in text)
+        sep = _SEPARATORS[level]
+        if sep:
+            # Each piece keeps the separator in front of it, as the recursive splitter does
+            parts = _SEP_RES[sep].split(text)
+            pieces = [parts[0]] + [parts[i] + parts[i + 1] for i in range(1, len(parts), 2)]
+            pieces = [piece for piece in pieces if piece]
+        else:
+            pieces = list(text)
+        
+        short: List[str] = []
+        for piece in pieces:
+            if len(piece) < size:
+                short.append(piece)
+                continue
+            if short:
+                DocumentProcessor._merge_pieces(short, size, overlap, chunks)
+                short = []
+            if sep:
+                DocumentProcessor._split_level(piece, level + 1, size, overlap, chunks)
+            else:
+                chunks.append(piece)
+        if short:
+            DocumentProcessor._merge_pieces(short, size, overlap, chunks)
+    
+    @staticmethod
+    def _merge_pieces(pieces: List[str], size: int, overlap: int, chunks: List[str]) -> None:
+        """Pack consecutive pieces into chunks of at most size, carrying up to overlap characters over"""
+        window: List[str] = []
+        total = 0
+        for piece in pieces:
+            if window and total + len(piece) > size:
+                chunk = "".join(window).strip()
+                if chunk:
+                    chunks.append(chunk)
+                while window and (total > overlap or total + len(piece) > size):
+                    total -= len(window.pop(0))
+            window.append(piece)
+            total += len(piece)
+        chunk = "".join(window).strip()
+        if chunk:
+            chunks.append(chunk)
     
     def extract_content(self, documents: List[Document]) -> Dict[str, str]:
         """Extract content from documents by type"""
-        resume_docs = [doc for doc in documents if doc.metadata.get('source_type') == 'resume']
-        job_docs = [doc for doc in documents if doc.metadata.get('source_type') == 'job_description']
+        # One pass over the documents, bucketing page text by source type
+        texts = {'resume': [], 'job_description': []}
+        for doc in documents:
+            bucket = texts.get(doc.metadata.get('source_type'))
+            if bucket is not None:
+                bucket.append(doc.page_content)
         
         return {
-            'resume_content': '\n'.join([doc.page_content for doc in resume_docs]),
-            'job_description': '\n'.join([doc.page_content for doc in job_docs])
+            'resume_content': '\n'.join(texts['resume']),
+            'job_description': '\n'.join(texts['job_description'])
         }
@@ -1,10 +1,57 @@
-import json
-from typing import List, Dict, Any
+import hashlib
+import os
+import orjson
+from typing import Any, Callable, Dict, List, Optional
 from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
 from langchain.schema.output_parser import StrOutputParser
 from src.prompts.prompts import PLANNING_PROMPT
 
+# Parsed once at import; the template is immutable and shared by every planner
+_PLANNING_TEMPLATE = ChatPromptTemplate.from_template(PLANNING_PROMPT)
+
+# Plans for an identical resume, job description, length, model and prompt are reused from here
+PLAN_CACHE_DIR = "./.plan_cache"
+
+# Used when AI planning fails, in priority order
+_FALLBACK_QUESTIONS = (
+    {
+        "question": "Tell me about your background and experience relevant to this role.",
+        "category": "experience",
+        "priority": 5,
+        "expected_skills": ["communication"],
+        "follow_up_prompts": ["Can you elaborate on specific projects?"]
+    },
+    {
+        "question": "What technical skills do you have that match this position?",
+        "category": "technical",
+        "priority": 4,
+        "expected_skills": ["technical_knowledge"],
+        "follow_up_prompts": ["Can you provide specific examples?"]
+    },
+    {
+        "question": "Describe a challenging problem you solved recently.",
+        "category": "problem_solving",
+        "priority": 4,
+        "expected_skills": ["analytical_thinking"],
+        "follow_up_prompts": ["What was your approach?"]
+    },
+    {
+        "question": "Why are you interested in this position and our company?",
+        "category": "behavioral",
+        "priority": 3,
+        "expected_skills": ["motivation", "cultural_fit"],
+        "follow_up_prompts": ["What specifically attracts you to this role?"]
+    },
+    {
+        "question": "Where do you see yourself in the next 3-5 years?",
+        "category": "behavioral",
+        "priority": 2,
+        "expected_skills": ["career_planning", "ambition"],
+        "follow_up_prompts": ["How does this role fit into your plans?"]
+    },
+)
+
 
 class InterviewPlanner:
     """Handles interview planning and question generation"""
@@ -12,11 +59,22 @@ class InterviewPlanner:
     def __init__(self, llm: ChatOpenAI, config=None):
         self.llm = llm
         self.config = config  # Store config reference
-        self.planning_prompt = ChatPromptTemplate.from_template(PLANNING_PROMPT)
-        self.chain = self.planning_prompt | self.llm | StrOutputParser()
+        self.planning_prompt = _PLANNING_TEMPLATE
+        # JSON mode: the model must answer with one strict JSON object, so no code fences
+        # or prose need stripping; still streamed as text so the first question arrives early
+        self.chain = (
+            self.planning_prompt
+            | self.llm.bind(response_format={"type": "json_object"})
+            | StrOutputParser()
+        )
     
-    def create_interview_plan(self, resume_content: str, job_description: str) -> List[Dict[str, Any]]:
-        """Create a comprehensive interview plan using AI planning"""
+    def create_interview_plan(self, resume_content: str, job_description: str,
+                              on_first_question: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+        """Create a comprehensive interview plan using AI planning.
+        
+        If given, on_first_question is called with the first planned question as soon as
+        it has streamed in, while the rest of the plan is still being generated.
+        """
         print("🎯 Creating interview plan...")
         
         # Get number of questions from config, default to 3
@@ -26,91 +84,136 @@ class InterviewPlanner:
         
         print(f"📊 Planning {number_of_questions} questions based on configuration")
         
+        cache_path = self._plan_cache_path(resume_content, job_description, number_of_questions)
+        cached_plan = self._load_cached_plan(cache_path)
+        if cached_plan is not None:
+            print(f"✅ Reused cached plan with {len(cached_plan)} questions")
+            if on_first_question is not None:
+                on_first_question(cached_plan[0])
+            return cached_plan
+        
         try:
-            plan_response = self.chain.invoke({
+            plan_response = self._stream_plan_response({
                 'resume_content': resume_content,
                 'job_description': job_description,
                 'number_of_questions': number_of_questions
-            })
-            
-            # Clean the response to extract JSON
-            plan_response = self._clean_json_response(plan_response)
+            }, on_first_question)
             
             # Parse the JSON response
-            interview_plan = json.loads(plan_response)
+            interview_plan = orjson.loads(plan_response)
+            if isinstance(interview_plan, dict):
+                interview_plan = interview_plan.get('questions')
             
             # Validate the plan structure
             if not isinstance(interview_plan, list) or len(interview_plan) == 0:
                 raise ValueError("Invalid interview plan format")
             
-            # Limit to configured number of questions if AI returned more
-            if len(interview_plan) > number_of_questions+2:  # Allow some buffer for AI variability
-                interview_plan = interview_plan[:number_of_questions]
+            # Every extra question costs an analysis call, so always hold to the configured number,
+            # keeping the highest-priority questions in the order the planner gave them
+            if len(interview_plan) > number_of_questions:
+                keep = sorted(range(len(interview_plan)),
+                              key=lambda i: -self._priority(interview_plan[i]))[:number_of_questions]
+                interview_plan = [interview_plan[i] for i in sorted(keep)]
                 print(f"⚠️ Trimmed plan to {number_of_questions} questions as per configuration")
             
             print(f"✅ Created plan with {len(interview_plan)} questions")
+            self._save_cached_plan(cache_path, interview_plan)
             return interview_plan
             
-        except (json.JSONDecodeError, ValueError, KeyError) as e:
+        except (orjson.JSONDecodeError, ValueError, KeyError) as e:
             print(f"❌ Error parsing interview plan: {e}")
             return self._get_fallback_questions(number_of_questions)
         except Exception as e:
             print(f"❌ Unexpected error creating plan: {e}")
             return self._get_fallback_questions(number_of_questions)
     
-    def _clean_json_response(self, response: str) -> str:
-        """Clean AI response to extract valid JSON"""
-        response = response.strip()
-        if response.startswith('```json'):
-            response = response[7:-3]
-        elif response.startswith('```'):
-            response = response[3:-3]
-        return response
+    @staticmethod
+    def _priority(question: Dict[str, Any]) -> float:
+        """A planned question's priority as a number; missing or malformed counts as lowest"""
+        try:
+            return float(question.get('priority', 0))
+        except (TypeError, ValueError):
+            return 0.0
+    
+    def _plan_cache_path(self, resume_content: str, job_description: str, number_of_questions: int) -> str:
+        """Cache file for a plan, keyed on everything the LLM's output depends on"""
+        key = hashlib.sha256('\0'.join((
+            resume_content, job_description, str(number_of_questions),
+            getattr(self.llm, 'model_name', ''), PLANNING_PROMPT
+        )).encode('utf-8')).hexdigest()
+        return os.path.join(PLAN_CACHE_DIR, f"{key}.json")
+    
+    def _load_cached_plan(self, cache_path: str) -> Optional[List[Dict[str, Any]]]:
+        """Read a previously generated plan, or None if there is no usable one"""
+        try:
+            with open(cache_path, 'rb') as f:
+                plan = orjson.loads(f.read())
+        except (OSError, orjson.JSONDecodeError):
+            return None
+        return plan if isinstance(plan, list) and plan else None
+    
+    def _save_cached_plan(self, cache_path: str, interview_plan: List[Dict[str, Any]]) -> None:
+        """Write a generated plan through to the cache; failures only cost a future LLM call"""
+        try:
+            os.makedirs(PLAN_CACHE_DIR, exist_ok=True)
+            with open(cache_path, 'wb') as f:
+                f.write(orjson.dumps(interview_plan))
+        except OSError as e:
+            print(f"⚠️ Could not cache interview plan: {e}")
+    
+    def _stream_plan_response(self, inputs: Dict[str, Any],
+                              on_first_question: Optional[Callable[[Dict[str, Any]], None]]) -> str:
+        """Collect the streamed plan, handing the first question object to on_first_question once it closes"""
+        chunks = []
+        obj_chars = []
+        depth = 0
+        array_depth = None
+        in_string = escaped = False
+        for chunk in self.chain.stream(inputs):
+            chunks.append(chunk)
+            if on_first_question is None:
+                continue
+            # Track bracket depth outside of string literals: questions are the objects
+            # directly inside the first array, so one closes when depth drops back to it
+            for ch in chunk:
+                if in_string:
+                    if escaped:
+                        escaped = False
+                    elif ch == '\\':
+                        escaped = True
+                    elif ch == '"':
+                        in_string = False
+                elif ch == '"':
+                    in_string = True
+                elif ch in '[{':
+                    depth += 1
+                    if ch == '[' and array_depth is None:
+                        array_depth = depth
+                        continue
+                elif ch in ']}':
+                    depth -= 1
+                if array_depth is None:
+                    continue
+                if depth > array_depth or (depth == array_depth and ch == '}'):
+                    obj_chars.append(ch)
+                if depth == array_depth and ch == '}' and not in_string:
+                    try:
+                        first_question = orjson.loads(''.join(obj_chars))
+                    except orjson.JSONDecodeError:
+                        first_question = None
+                    if isinstance(first_question, dict) and first_question.get('question'):
+                        on_first_question(first_question)
+                        on_first_question = None
+                        break
+                    obj_chars.clear()
+        return ''.join(chunks)
     
     def _get_fallback_questions(self, number_of_questions: int = 3) -> List[Dict[str, Any]]:
         """Provide fallback questions when AI planning fails"""
         print(f"✅ Using fallback question set with {number_of_questions} questions")
         
-        all_fallback_questions = [
-            {
-                "question": "Tell me about your background and experience relevant to this role.",
-                "category": "experience",
-                "priority": 5,
-                "expected_skills": ["communication"],
-                "follow_up_prompts": ["Can you elaborate on specific projects?"]
-            },
-            {
-                "question": "What technical skills do you have that match this position?",
-                "category": "technical",
-                "priority": 4,
-                "expected_skills": ["technical_knowledge"],
-                "follow_up_prompts": ["Can you provide specific examples?"]
-            },
-            {
-                "question": "Describe a challenging problem you solved recently.",
-                "category": "problem_solving",
-                "priority": 4,
-                "expected_skills": ["analytical_thinking"],
-                "follow_up_prompts": ["What was your approach?"]
-            },
-            {
-                "question": "Why are you interested in this position and our company?",
-                "category": "behavioral",
-                "priority": 3,
-                "expected_skills": ["motivation", "cultural_fit"],
-                "follow_up_prompts": ["What specifically attracts you to this role?"]
-            },
-            {
-                "question": "Where do you see yourself in the next 3-5 years?",
-                "category": "behavioral",
-                "priority": 2,
-                "expected_skills": ["career_planning", "ambition"],
-                "follow_up_prompts": ["How does this role fit into your plans?"]
-            }
-        ]
-        
-        # Return only the requested number of questions
-        return all_fallback_questions[:number_of_questions]
+        # Fresh dicts: the plan ends up in session state and is serialized with the session
+        return [dict(q) for q in _FALLBACK_QUESTIONS[:number_of_questions]]
     
     def get_next_question(self, interview_plan: List[Dict[str, Any]], current_idx: int) -> str:
         """Get the next question from the interview plan"""
@@ -1,25 +1,174 @@
-from typing import List, Tuple, Optional
+import asyncio
+import math
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from itertools import zip_longest
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Tuple, Optional
+import faiss
+import numpy as np
 from langchain.schema import Document
 from langchain_community.vectorstores import FAISS
 from langchain_openai import OpenAIEmbeddings
 
 
+# Loaded indexes shared by every RAGSystem in the process, keyed by
+# (index_path, embedding model, index file mtime) so a rebuilt index is reloaded.
+# Least recently used first; each interview has its own index, so the cache is bounded
+_INDEX_CACHE: "OrderedDict[Tuple[str, str, float], FAISS]" = OrderedDict()
+_INDEX_CACHE_LOCK = threading.Lock()
+MAX_CACHED_INDEXES = 8
+
+# Upper bound on pre-embedded question queries kept per RAGSystem
+MAX_QUERY_EMBEDDINGS = 256
+
+# Large indexes are embedded in concurrent batches rather than one request at a time
+EMBED_BATCH_SIZE = 100
+MAX_CONCURRENT_EMBED_REQUESTS = 8
+
+# Touched whenever an index is loaded, so indexes still in use are never purged as stale
+_LAST_USED_MARKER = "last_used"
+
+# Background context lookups for questions that are on screen but not yet answered
+_PREFETCH_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="rag-prefetch")
+
+
+def clear_faiss_cache() -> None:
+    """Drop all FAISS indexes cached in this process"""
+    with _INDEX_CACHE_LOCK:
+        _INDEX_CACHE.clear()
+
+
+def _cached_index(cache_key: Tuple[str, str, float]) -> Optional[FAISS]:
+    with _INDEX_CACHE_LOCK:
+        vector_store = _INDEX_CACHE.get(cache_key)
+        if vector_store is not None:
+            _INDEX_CACHE.move_to_end(cache_key)
+        return vector_store
+
+
+def _cache_index(cache_key: Tuple[str, str, float], vector_store: FAISS) -> None:
+    """Cache a loaded index, replacing older versions of the same path and evicting the least recently used"""
+    with _INDEX_CACHE_LOCK:
+        for key in [key for key in _INDEX_CACHE if key[0] == cache_key[0]]:
+            del _INDEX_CACHE[key]
+        _INDEX_CACHE[cache_key] = vector_store
+        while len(_INDEX_CACHE) > MAX_CACHED_INDEXES:
+            _INDEX_CACHE.popitem(last=False)
+
+
+def _evict_index(index_path: str) -> None:
+    """Forget every cached version of the index at index_path"""
+    path = os.path.abspath(index_path)
+    with _INDEX_CACHE_LOCK:
+        for key in [key for key in _INDEX_CACHE if key[0] == path]:
+            del _INDEX_CACHE[key]
+
+
+def _merge_hits(primary: Tuple[str, ...], secondary: Tuple[str, ...], k: int) -> List[str]:
+    """Interleave two ranked hit lists, best first, without duplicates, keeping at most k"""
+    merged: List[str] = []
+    for pair in zip_longest(primary, secondary):
+        for hit in pair:
+            if hit is not None and hit not in merged:
+                merged.append(hit)
+    return merged[:k]
+
+
+def _mark_used(index_path: str) -> None:
+    """Record that the index at index_path was just used"""
+    marker = os.path.join(index_path, _LAST_USED_MARKER)
+    try:
+        with open(marker, "a"):
+            pass
+        os.utime(marker)
+    except OSError:
+        pass
+
+
+def _last_used(index_path: str) -> float:
+    """When the index at index_path was last loaded or written, whichever is later"""
+    times = [os.path.getmtime(os.path.join(index_path, "index.faiss"))]
+    try:
+        times.append(os.path.getmtime(os.path.join(index_path, _LAST_USED_MARKER)))
+    except OSError:
+        pass
+    return max(times)
+
+
+def purge_stale_indexes(root: str, max_age_days: int) -> None:
+    """Delete index directories under root that haven't been loaded or written in max_age_days"""
+    cutoff = time.time() - max_age_days * 86400
+    try:
+        entries = list(os.scandir(root))
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        try:
+            if entry.is_dir() and _last_used(entry.path) < cutoff:
+                shutil.rmtree(entry.path)
+                _evict_index(entry.path)
+                print(f"🧹 Removed stale FAISS index {entry.name}")
+        except OSError:
+            continue
+
+
 class RAGSystem:
     """Manages vector store operations for RAG functionality"""
     
-    def __init__(self, embeddings: OpenAIEmbeddings, index_path: str = "./interview_faiss_index"):
+    def __init__(self, embeddings: OpenAIEmbeddings, index_path: str = "./interview_faiss_index",
+                 index_type: str = "flat"):
         self.embeddings = embeddings
         self.index_path = index_path
-        self.vector_store: Optional[FAISS] = None
+        self.index_type = index_type
+        # The prefetch executor, the plan warm-up thread and the caller all use the caches below
+        self._cache_lock = threading.Lock()
+        self._vector_store: Optional[FAISS] = None
+        # Question text -> embedding of its retrieval query, filled by embed_queries
+        self._query_embeddings: Dict[str, List[float]] = {}
+        # (question, k) -> (embedding searched, pending lookup) started by prefetch_question_context
+        self._context_futures: Dict[Tuple[str, int], Tuple[Optional[List[float]], Future]] = {}
+        # (question, k) -> chunks found through the question's pre-computed embedding
+        self._question_contexts: Dict[Tuple[str, int], Tuple[str, ...]] = {}
+        # (query, k) -> chunks found for an ad-hoc query
+        self._contexts: Dict[Tuple[str, int], Tuple[str, ...]] = {}
+    
+    @property
+    def vector_store(self) -> Optional[FAISS]:
+        return self._vector_store
+    
+    @vector_store.setter
+    def vector_store(self, vector_store: Optional[FAISS]) -> None:
+        """Contexts found in the previous store are dropped along with it"""
+        with self._cache_lock:
+            self._vector_store = vector_store
+            self._question_contexts = {}
+            self._contexts = {}
+            self._context_futures = {}
     
     def load_existing_index(self) -> bool:
         """Load existing FAISS index if available"""
         try:
+            mtime = os.path.getmtime(os.path.join(self.index_path, "index.faiss"))
+            cache_key = (os.path.abspath(self.index_path), getattr(self.embeddings, 'model', ''), mtime)
+            
+            cached = _cached_index(cache_key)
+            if cached is not None:
+                self.vector_store = cached
+                _mark_used(self.index_path)
+                print("✅ Reused cached FAISS index")
+                return True
+            
             self.vector_store = FAISS.load_local(
                 self.index_path, 
                 self.embeddings,
                 allow_dangerous_deserialization=True
             )
+            _cache_index(cache_key, self.vector_store)
+            _mark_used(self.index_path)
             print("✅ Loaded existing FAISS index")
             return True
         except FileNotFoundError:
@@ -33,14 +182,67 @@ class RAGSystem:
         """Create new FAISS index from documents"""
         print("🔧 Building new FAISS index...")
         
+        # More than one batch is worth embedding concurrently, unless we're already inside
+        # an event loop (asyncio.run can't nest); small corpora take the single-request path
+        if len(documents) > EMBED_BATCH_SIZE:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                asyncio.run(self.acreate_index(documents))
+                return
+        
         self.vector_store = FAISS.from_documents(
             documents=documents,
             embedding=self.embeddings
         )
+        self._finish_index()
+    
+    async def acreate_index(self, documents: List[Document]) -> None:
+        """Create new FAISS index, embedding batches of documents concurrently"""
+        texts = [doc.page_content for doc in documents]
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_EMBED_REQUESTS)
+        
+        async def embed(batch: List[str]) -> List[List[float]]:
+            async with semaphore:
+                return await self.embeddings.aembed_documents(batch)
+        
+        results = await asyncio.gather(*(
+            embed(texts[i:i + EMBED_BATCH_SIZE]) for i in range(0, len(texts), EMBED_BATCH_SIZE)
+        ))
+        vectors = [vector for batch in results for vector in batch]
+        
+        self.vector_store = FAISS.from_embeddings(
+            list(zip(texts, vectors)),
+            self.embeddings,
+            metadatas=[doc.metadata for doc in documents]
+        )
+        self._finish_index()
+    
+    def _finish_index(self) -> None:
+        """Convert a freshly built flat index to the configured type and save it"""
+        if self.index_type != "flat":
+            self.vector_store.index = self._approximate_index(self.vector_store.index)
         
         self.save_index()
         print("💾 FAISS index saved successfully")
     
+    def _approximate_index(self, flat_index: faiss.Index) -> faiss.Index:
+        """Move the vectors of a flat L2 index into an HNSW or IVF index for larger corpora"""
+        vectors = flat_index.reconstruct_n(0, flat_index.ntotal)
+        dim = flat_index.d
+        if self.index_type == "hnsw":
+            index = faiss.IndexHNSWFlat(dim, 32)
+        elif self.index_type == "ivf":
+            # ~sqrt(n) lists is the usual starting point; IVF needs at least one vector per list
+            nlist = max(1, int(math.sqrt(flat_index.ntotal)))
+            index = faiss.IndexIVFFlat(faiss.IndexFlatL2(dim), dim, nlist)
+            index.train(vectors)
+            index.nprobe = min(nlist, 8)
+        else:
+            raise ValueError(f"Unknown index type: {self.index_type}")
+        index.add(vectors)
+        return index
+    
     def save_index(self) -> None:
         """Save current FAISS index"""
         if self.vector_store:
@@ -64,5 +266,140 @@ class RAGSystem:
     
     def get_context(self, query: str, k: int = 3) -> str:
         """Get relevant context as formatted string"""
-        relevant_docs = self.similarity_search(query, k=k)
-        return "\n".join([doc.page_content for doc in relevant_docs])
+        return "\n".join(self._query_hits(query, k))
+    
+    def _query_hits(self, query: str, k: int) -> Tuple[str, ...]:
+        """Chunks most similar to query, embedding it on a cache miss"""
+        with self._cache_lock:
+            store = self._vector_store
+            hits = self._contexts.get((query, k))
+        if not store:
+            return ()
+        if hits is None:
+            hits = tuple(doc.page_content for doc in store.similarity_search(query, k=k))
+            self._remember(self._contexts, (query, k), hits, store)
+        return hits
+    
+    def _remember(self, cache: Dict, key, value, store: Optional[FAISS] = None) -> None:
+        """Store an entry in one of the bounded caches, dropping the oldest ones once it is full.
+        
+        With store, the entry was found in that vector store and is dropped if the store has
+        since been replaced (the setter swaps in fresh caches).
+        """
+        with self._cache_lock:
+            if store is not None and store is not self._vector_store:
+                return
+            while len(cache) >= MAX_QUERY_EMBEDDINGS:
+                del cache[next(iter(cache))]
+            cache[key] = value
+    
+    def embed_queries(self, queries: Dict[str, str]) -> None:
+        """Embed the retrieval query of every planned question in one request.
+        
+        queries maps question text to the text to embed for it.
+        """
+        if not queries:
+            return
+        try:
+            vectors = self.embeddings.embed_documents(list(queries.values()))
+        except Exception as e:
+            print(f"⚠️ Could not pre-embed question queries: {e}")
+            return
+        for question, vector in zip(queries, vectors):
+            self._remember(self._query_embeddings, question, vector)
+        # Contexts found through a question's previous embedding no longer apply
+        with self._cache_lock:
+            for key in [key for key in self._question_contexts if key[0] in queries]:
+                del self._question_contexts[key]
+    
+    def warm_question_contexts(self, queries: Dict[str, str], k: int = 3) -> None:
+        """Embed every planned question in one request, then look up all their contexts locally"""
+        self.embed_queries(queries)
+        try:
+            self.get_contexts_batch(list(queries), k)
+        except Exception as e:
+            print(f"⚠️ Could not look up context for the planned questions: {e}")
+    
+    def get_contexts_batch(self, questions: List[str], k: int = 3) -> Dict[str, str]:
+        """Contexts for several pre-embedded questions, searched as one matrix in a single FAISS call.
+        
+        Questions without a pre-computed embedding are searched individually by their own text.
+        """
+        # The whole batch is searched in, and its indexes resolved against, this one store
+        with self._cache_lock:
+            store = self._vector_store
+        if not store:
+            return {question: "" for question in questions}
+        contexts = {}
+        pending = []
+        vectors = []
+        for question in questions:
+            with self._cache_lock:
+                hits = self._question_contexts.get((question, k)) if store is self._vector_store else None
+                vector = self._query_embeddings.get(question)
+            if hits is not None:
+                contexts[question] = "\n".join(hits)
+            elif vector is not None:
+                pending.append(question)
+                vectors.append(vector)
+            else:
+                contexts[question] = self.get_context(question, k=k)
+        if not pending:
+            return contexts
+        
+        matrix = np.array(vectors, dtype=np.float32)
+        if store._normalize_L2:
+            faiss.normalize_L2(matrix)
+        _, ids = store.index.search(matrix, k)
+        
+        docstore_ids = store.index_to_docstore_id
+        for question, row in zip(pending, ids):
+            hits = tuple(store.docstore.search(docstore_ids[i]).page_content for i in row if i != -1)
+            self._remember(self._question_contexts, (question, k), hits, store)
+            contexts[question] = "\n".join(hits)
+        return contexts
+    
+    def prefetch_question_context(self, question: str, k: int = 3) -> None:
+        """Start looking up a question's context in the background while the candidate answers it"""
+        key = (question, k)
+        with self._cache_lock:
+            if key in self._context_futures:
+                return
+            vector = self._query_embeddings.get(question)
+        # Remember which embedding was searched, so a result is only reused for that same query
+        self._remember(self._context_futures, key,
+                       (vector, _PREFETCH_EXECUTOR.submit(self._question_hits, question, k, vector)))
+    
+    def get_question_context(self, question: str, answer_query: str, k: int = 3) -> str:
+        """Get context for analysing an answer to a planned question.
+        
+        Chunks found for answer_query (the question together with the candidate's answer) come
+        first, interleaved with the chunks found in advance through the plan's retrieval query,
+        so the context follows what the candidate actually said.
+        """
+        with self._cache_lock:
+            prefetched = self._context_futures.pop((question, k), None)
+            vector = self._query_embeddings.get(question)
+        question_hits: Optional[Tuple[str, ...]] = None
+        # A prefetch that ran before the plan's embeddings arrived searched something else
+        if prefetched is not None and prefetched[0] is vector:
+            try:
+                question_hits = prefetched[1].result()
+            except Exception as e:
+                print(f"⚠️ Prefetched context lookup failed: {e}")
+        if question_hits is None:
+            question_hits = self._question_hits(question, k, vector)
+        return "\n".join(_merge_hits(self._query_hits(answer_query, k), question_hits, k))
+    
+    def _question_hits(self, question: str, k: int, vector: Optional[List[float]]) -> Tuple[str, ...]:
+        """Chunks found through the question's pre-computed retrieval embedding; none without one"""
+        key = (question, k)
+        with self._cache_lock:
+            store = self._vector_store
+            hits = self._question_contexts.get(key)
+        if vector is None or not store:
+            return ()
+        if hits is None:
+            hits = tuple(doc.page_content for doc in store.similarity_search_by_vector(vector, k=k))
+            self._remember(self._question_contexts, key, hits, store)
+        return hits
@@ -1,29 +1,64 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Tuple
 from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
 from langchain.schema.output_parser import StrOutputParser
 from src.prompts.prompts import REPORT_PROMPT
 
+# Parsed once at import and shared by every report generator
+_REPORT_TEMPLATE = ChatPromptTemplate.from_template(REPORT_PROMPT)
+
+_NOTE_SEPARATOR = "-" * 50 + "\n"
+
+# How much of each document the report prompt sees (token limits)
+RESUME_PROMPT_CHARS = 2048
+JOB_DESC_PROMPT_CHARS = 1024
+
 
 class ReportGenerator:
     """Handles generation of comprehensive interview reports"""
     
     def __init__(self, llm: ChatOpenAI):
         self.llm = llm
-        self.report_prompt = ChatPromptTemplate.from_template(REPORT_PROMPT)
+        self.report_prompt = _REPORT_TEMPLATE
         self.chain = self.report_prompt | self.llm | StrOutputParser()
     
-    def generate_report(self, resume_content: str, job_description: str, 
+    @staticmethod
+    def prompt_excerpts(resume_content: str, job_description: str) -> Tuple[str, str]:
+        """The parts of the resume and job description that fit in the report prompt"""
+        return resume_content[:RESUME_PROMPT_CHARS], job_description[:JOB_DESC_PROMPT_CHARS]
+    
+    def generate_report(self, resume_excerpt: str, job_description_excerpt: str,
                        interview_notes: List[Dict[str, Any]]) -> str:
-        """Generate comprehensive interview report"""
+        """Generate comprehensive interview report from pre-truncated documents (see prompt_excerpts)"""
         print("📊 Generating interview report...")
         
         notes_text = self._format_interview_notes(interview_notes)
         
         try:
             report = self.chain.invoke({
-                'resume_content': resume_content[:2048],  # Truncate for token limits
-                'job_description': job_description[:1024],  # Truncate for token limits
+                'resume_content': resume_excerpt,
+                'job_description': job_description_excerpt,
+                'interview_notes': notes_text
+            })
+            
+            print("✅ Interview report generated successfully!")
+            return report
+            
+        except Exception as e:
+            print(f"❌ Error generating report: {e}")
+            return f"Report generation failed: {e}"
+    
+    async def agenerate_report(self, resume_excerpt: str, job_description_excerpt: str,
+                               interview_notes: List[Dict[str, Any]]) -> str:
+        """Async variant of generate_report, so the event loop stays free during the LLM call"""
+        print("📊 Generating interview report...")
+        
+        notes_text = self._format_interview_notes(interview_notes)
+        
+        try:
+            report = await self.chain.ainvoke({
+                'resume_content': resume_excerpt,
+                'job_description': job_description_excerpt,
                 'interview_notes': notes_text
             })
             
@@ -34,16 +69,35 @@ class ReportGenerator:
             print(f"❌ Error generating report: {e}")
             return f"Report generation failed: {e}"
     
+    def generate_report_stream(self, resume_excerpt: str, job_description_excerpt: str,
+                               interview_notes: List[Dict[str, Any]]) -> Iterator[str]:
+        """Generate the interview report from pre-truncated documents, yielding it as it is generated"""
+        print("📊 Generating interview report...")
+        
+        notes_text = self._format_interview_notes(interview_notes)
+        
+        try:
+            for chunk in self.chain.stream({
+                'resume_content': resume_excerpt,
+                'job_description': job_description_excerpt,
+                'interview_notes': notes_text
+            }):
+                yield chunk
+                
+        except Exception as e:
+            print(f"❌ Error generating report: {e}")
+            yield f"Report generation failed: {e}"
+    
     def _format_interview_notes(self, interview_notes: List[Dict[str, Any]]) -> str:
         """Format interview notes for the report prompt"""
-        notes_text = ""
-        for i, note in enumerate(interview_notes, 1):
-            notes_text += f"\nQuestion {i}: {note['question']}\n"
-            notes_text += f"Response: {note['response']}\n"
-            notes_text += f"Score: {note['score']}/10\n"
-            notes_text += f"Analysis: {note['analysis']}\n"
-            notes_text += "-" * 50 + "\n"
-        return notes_text
+        return "".join(
+            f"\nQuestion {i}: {note['question']}\n"
+            f"Response: {note['response']}\n"
+            f"Score: {note['score']}/10\n"
+            f"Analysis: {note['analysis']}\n"
+            f"{_NOTE_SEPARATOR}"
+            for i, note in enumerate(interview_notes, 1)
+        )
     
     def calculate_overall_score(self, interview_notes: List[Dict[str, Any]]) -> float:
         """Calculate overall interview score"""
@@ -1,17 +1,24 @@
+import re
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List
 from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
 from langchain.schema.output_parser import StrOutputParser
 from src.prompts.prompts import ANALYSIS_PROMPT
 
+# Parsed once at import and shared by every analyzer
+_ANALYSIS_TEMPLATE = ChatPromptTemplate.from_template(ANALYSIS_PROMPT)
+
+# The "SCORE: n" line of an analysis; tolerates "[7]" and "7/10"
+_SCORE_RE = re.compile(r"^\s*SCORE:\s*\[?(\d+)", re.MULTILINE)
+
 
 class ResponseAnalyzer:
     """Handles analysis of candidate responses"""
     
     def __init__(self, llm: ChatOpenAI):
         self.llm = llm
-        self.analysis_prompt = ChatPromptTemplate.from_template(ANALYSIS_PROMPT)
+        self.analysis_prompt = _ANALYSIS_TEMPLATE
         self.chain = self.analysis_prompt | self.llm | StrOutputParser()
     
     def analyze_response(self, question: str, response: str, rag_context: str, 
@@ -22,21 +29,63 @@ class ResponseAnalyzer:
         if not response:
             return "No response provided"
         
-        conversation_text = self._format_conversation_history(conversation_history)
-        
         try:
-            analysis = self.chain.invoke({
-                'question': question,
-                'response': response,
-                'rag_context': rag_context,
-                'conversation_history': conversation_text
-            })
+            analysis = self.chain.invoke(
+                self._build_inputs(question, response, rag_context, conversation_history)
+            )
             return analysis
             
         except Exception as e:
             print(f"❌ Error analyzing response: {e}")
             return f"Analysis failed: {e}"
     
+    async def aanalyze_response(self, question: str, response: str, rag_context: str,
+                                conversation_history: List[Dict[str, str]], announce: bool = True) -> str:
+        """Async variant of analyze_response, so other work can overlap the LLM call"""
+        if announce:
+            print("🔬 Analyzing response...")
+        
+        if not response:
+            return "No response provided"
+        
+        try:
+            return await self.chain.ainvoke(
+                self._build_inputs(question, response, rag_context, conversation_history)
+            )
+            
+        except Exception as e:
+            print(f"❌ Error analyzing response: {e}")
+            return f"Analysis failed: {e}"
+    
+    def analyze_response_stream(self, question: str, response: str, rag_context: str,
+                                conversation_history: List[Dict[str, str]]) -> Iterator[str]:
+        """Analyze candidate response, yielding the analysis as it is generated"""
+        print("🔬 Analyzing response...")
+        
+        if not response:
+            yield "No response provided"
+            return
+        
+        try:
+            for chunk in self.chain.stream(
+                self._build_inputs(question, response, rag_context, conversation_history)
+            ):
+                yield chunk
+                
+        except Exception as e:
+            print(f"❌ Error analyzing response: {e}")
+            yield f"Analysis failed: {e}"
+    
+    def _build_inputs(self, question: str, response: str, rag_context: str,
+                      conversation_history: List[Dict[str, str]]) -> Dict[str, str]:
+        """Build the prompt inputs for the analysis chain"""
+        return {
+            'question': question,
+            'response': response,
+            'rag_context': rag_context,
+            'conversation_history': self._format_conversation_history(conversation_history)
+        }
+    
     def _format_conversation_history(self, conversation_history: List[Dict[str, str]]) -> str:
         """Format conversation history for prompt"""
         return "\n".join([
@@ -46,15 +95,8 @@ class ResponseAnalyzer:
     
     def extract_score(self, analysis: str) -> int:
         """Extract numerical score from analysis"""
-        score = 5  # default
-        for line in analysis.split('\n'):
-            if line.startswith('SCORE:'):
-                try:
-                    score = int(line.split(':')[1].strip().split()[0])
-                except:
-                    score = 5
-                break
-        return score
+        match = _SCORE_RE.search(analysis)
+        return int(match.group(1)) if match else 5  # default
     
     def create_interview_note(self, question: str, response: str, analysis: str, 
                             question_category: str) -> Dict[str, Any]:
@@ -1,14 +1,30 @@
-from typing import Dict, Optional
+import asyncio
+import hashlib
+import os
+import threading
+import orjson
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from langchain.schema import Document
 from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 
 from src.core.models import InterviewState, InterviewConfig
 from src.components.document_processor import DocumentProcessor
-from src.components.rag_system import RAGSystem
+from src.components.rag_system import RAGSystem, purge_stale_indexes
 from src.components.interview_planner import InterviewPlanner
 from src.components.response_analyzer import ResponseAnalyzer
 from src.components.report_generator import ReportGenerator
 from src.core.workflow_manager import InterviewWorkflowManager
 
+# Cached per-document indexes not loaded or rebuilt for this long are deleted when a new one is built
+INDEX_MAX_AGE_DAYS = 30
+
+# Per-task generation settings
+PLAN_TOKENS_PER_QUESTION = 150
+ANALYSIS_TEMPERATURE = 0.1
+# Room for every section of a long analysis; 256 tokens cut them off mid-way
+ANALYSIS_MAX_TOKENS = 500
+REPORT_MAX_TOKENS = 2000
+
 
 class InterviewSystem:
     """Main interview system that orchestrates all components"""
@@ -22,6 +38,15 @@ class InterviewSystem:
             model=self.config.model_name,
             api_key=openai_api_key
         )
+        # Task-specific models: output length dominates latency, so each task gets a token cap
+        # sized to what it should produce, and scoring runs cooler than free-form writing
+        planner_llm = self.llm.model_copy(update={
+            'max_tokens': PLAN_TOKENS_PER_QUESTION * self.config.max_questions + 200
+        })
+        analysis_llm = self.llm.model_copy(update={
+            'temperature': ANALYSIS_TEMPERATURE, 'max_tokens': ANALYSIS_MAX_TOKENS
+        })
+        report_llm = self.llm.model_copy(update={'max_tokens': REPORT_MAX_TOKENS})
         
         self.embeddings = OpenAIEmbeddings(api_key=openai_api_key, model="text-embedding-3-small")
         
@@ -33,33 +58,106 @@ class InterviewSystem:
         
         self.rag_system = RAGSystem(
             embeddings=self.embeddings,
-            index_path=self.config.index_path
+            index_path=self.config.index_path,
+            index_type=self.config.index_type
         )
         
         # Pass config to planner so it can use max_questions
-        self.planner = InterviewPlanner(self.llm, config=self.config)
-        self.analyzer = ResponseAnalyzer(self.llm)
-        self.report_generator = ReportGenerator(self.llm)
+        self.planner = InterviewPlanner(planner_llm, config=self.config)
+        self.analyzer = ResponseAnalyzer(analysis_llm)
+        self.report_generator = ReportGenerator(report_llm)
         
         # Initialize workflow manager
         self.workflow_manager = InterviewWorkflowManager(self)
     
     def setup_rag_system(self, resume_path: str, job_desc_path: str, force_rebuild: bool = False) -> Dict[str, str]:
         """Initialize the RAG system with resume and job description"""
+        manifest_path = self._source_manifest_path(resume_path, job_desc_path)
+        
+        # Unchanged files whose index is still on disk need no parsing at all
+        if not force_rebuild:
+            doc_content = self._load_source_manifest(manifest_path)
+            if doc_content is not None:
+                return doc_content
+        
+        documents = self.document_processor.load_documents(resume_path, job_desc_path)
+        doc_content = self._setup_rag_from_documents(documents, force_rebuild)
+        
+        try:
+            os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+            with open(manifest_path, 'wb') as f:
+                f.write(orjson.dumps({
+                    'index_key': os.path.basename(self.rag_system.index_path),
+                    'resume_content': doc_content['resume_content'],
+                    'job_description': doc_content['job_description'],
+                }))
+        except OSError as e:
+            print(f"⚠️ Could not save parsed document content: {e}")
+        return doc_content
+    
+    def _source_manifest_path(self, resume_path: str, job_desc_path: str) -> str:
+        """Where the parsed content of this exact pair of files (by path, size and mtime) is kept"""
+        parts = [str(self.config.chunk_size), str(self.config.chunk_overlap), self.embeddings.model,
+                 self.config.index_type]
+        for path in (resume_path, job_desc_path):
+            try:
+                stat = os.stat(path)
+                parts.extend((os.path.abspath(path), str(stat.st_size), str(stat.st_mtime_ns)))
+            except OSError:
+                parts.append(os.path.abspath(path))
+        source_key = hashlib.blake2b('\0'.join(parts).encode('utf-8'), digest_size=16).hexdigest()
+        return os.path.join(self.config.index_path, 'sources', f"{source_key}.json")
+    
+    def _load_source_manifest(self, manifest_path: str) -> Optional[Dict[str, str]]:
+        """Load the index a manifest points at and return the saved content, or None on a miss"""
+        try:
+            with open(manifest_path, 'rb') as f:
+                manifest = orjson.loads(f.read())
+        except (OSError, orjson.JSONDecodeError):
+            return None
+        
+        self.rag_system.index_path = os.path.join(self.config.index_path, manifest['index_key'])
+        if not self.rag_system.load_existing_index():
+            return None
+        print("✅ Reused parsed documents")
+        return self._with_prompt_excerpts(
+            {'resume_content': manifest['resume_content'], 'job_description': manifest['job_description']}
+        )
+    
+    def _with_prompt_excerpts(self, doc_content: Dict[str, str]) -> Dict[str, str]:
+        """Add the report prompt's truncated copies of the documents, cut once at ingest"""
+        doc_content['resume_for_prompt'], doc_content['job_description_for_prompt'] = (
+            ReportGenerator.prompt_excerpts(doc_content['resume_content'], doc_content['job_description'])
+        )
+        return doc_content
+    
+    def _setup_rag_from_documents(self, documents: List[Document], force_rebuild: bool = False) -> Dict[str, str]:
+        """Initialize the RAG system from already loaded documents"""
+        doc_content = self._with_prompt_excerpts(self.document_processor.extract_content(documents))
+        
+        # One index per distinct pair of documents and chunking/embedding settings: the same
+        # inputs reuse their embeddings, and anything else never picks up a stale index
+        index_key = hashlib.blake2b(
+            '\0'.join((
+                doc_content['resume_content'], doc_content['job_description'],
+                str(self.config.chunk_size), str(self.config.chunk_overlap), self.embeddings.model,
+                self.config.index_type
+            )).encode('utf-8'),
+            digest_size=16
+        ).hexdigest()
+        self.rag_system.index_path = os.path.join(self.config.index_path, index_key)
         
         # Try to load existing index first (unless force rebuild)
         if not force_rebuild and self.rag_system.load_existing_index():
-            # Still need to load document content for state
-            documents = self.document_processor.load_documents(resume_path, job_desc_path)
-            return self.document_processor.extract_content(documents)
+            return doc_content
         
         # Build new index
         print("🔧 Building new FAISS index...")
-        documents = self.document_processor.load_documents(resume_path, job_desc_path)
         splits = self.document_processor.split_documents(documents)
         self.rag_system.create_index(splits)
+        purge_stale_indexes(self.config.index_path, INDEX_MAX_AGE_DAYS)
         
-        return self.document_processor.extract_content(documents)
+        return doc_content
 
     # Create automated interview process for demo - WIP
     def conduct_full_interview(self, resume_path: str, job_desc_path: str) -> InterviewState:
@@ -74,7 +172,10 @@ class InterviewSystem:
             initial_state = InterviewState(
                 resume_content=doc_content['resume_content'],
                 job_description=doc_content['job_description'],
+                resume_for_prompt=doc_content['resume_for_prompt'],
+                job_description_for_prompt=doc_content['job_description_for_prompt'],
                 interview_plan=[],
+                categories=[],
                 current_question_idx=0,
                 current_question="",
                 candidate_response="",
@@ -100,12 +201,34 @@ class InterviewSystem:
         
         # Setup RAG system
         doc_content = self.setup_rag_system(resume_path, job_desc_path)
+        return self._begin_interactive_interview(doc_content)
+    
+    def start_interactive_interview_from_text(self, resume_text: str, resume_name: str,
+                                              job_desc_text: str, job_desc_name: str,
+                                              on_first_question: Optional[Callable[[Dict[str, Any]], None]] = None
+                                              ) -> InterviewState:
+        """Start an interactive interview session from already extracted document text"""
+        print("🚀 Starting Interactive Interview...")
         
+        # Setup RAG system
+        documents = self.document_processor.load_documents_from_text(
+            resume_text, resume_name, job_desc_text, job_desc_name
+        )
+        doc_content = self._setup_rag_from_documents(documents)
+        return self._begin_interactive_interview(doc_content, on_first_question)
+    
+    def _begin_interactive_interview(self, doc_content: Dict[str, str],
+                                     on_first_question: Optional[Callable[[Dict[str, Any]], None]] = None
+                                     ) -> InterviewState:
+        """Build the initial interactive state and create the interview plan"""
         # Initialize state for interactive mode
         state = InterviewState(
             resume_content=doc_content['resume_content'],
             job_description=doc_content['job_description'],
+            resume_for_prompt=doc_content['resume_for_prompt'],
+            job_description_for_prompt=doc_content['job_description_for_prompt'],
             interview_plan=[],
+            categories=[],
             current_question_idx=0,
             current_question="",
             candidate_response="",
@@ -119,7 +242,12 @@ class InterviewSystem:
         
         # Process documents and create plan
         state = self.workflow_manager._process_documents(state)
-        state = self.workflow_manager._create_interview_plan(state)
+        state = self.workflow_manager._create_interview_plan(state, on_first_question)
+        
+        # Embed every question's retrieval query in one request and look up all their contexts,
+        # in the background, so answering a question doesn't wait on retrieval
+        queries = {q['question']: q.get('retrieval_query') or q['question'] for q in state['interview_plan']}
+        threading.Thread(target=self.rag_system.warm_question_contexts, args=(queries,), daemon=True).start()
         
         return state
     
@@ -129,7 +257,11 @@ class InterviewSystem:
             return None
         
         state = self.workflow_manager._generate_next_question(state)
-        return state['current_question'] if not state.get('is_complete') else None
+        if state.get('is_complete'):
+            return None
+        # Retrieval for this question can run while the candidate is still answering it
+        self.rag_system.prefetch_question_context(state['current_question'])
+        return state['current_question']
     
     def process_candidate_answer(self, state: InterviewState, answer: str) -> InterviewState:
         """Process a candidate's answer and update state"""
@@ -142,6 +274,61 @@ class InterviewSystem:
         
         return state
     
+    async def aprocess_candidate_answer(self, state: InterviewState, answer: str) -> InterviewState:
+        """Async variant of process_candidate_answer; the analysis call doesn't block the event loop.
+        
+        It runs while the candidate is typing the next answer, so the step messages are left out.
+        """
+        state['candidate_response'] = answer
+        
+        # FAISS search is CPU-bound C++ and may embed the query, so keep it off the loop
+        state = await asyncio.to_thread(self.workflow_manager._retrieve_context, state, announce=False)
+        state['current_analysis'] = await self.analyzer.aanalyze_response(
+            state['current_question'],
+            state['candidate_response'],
+            state['rag_context'],
+            state['conversation_history'],
+            announce=False
+        )
+        return self.workflow_manager._take_notes(state, announce=False)
+    
+    def process_candidate_answer_stream(self, state: InterviewState, answer: str) -> Iterator[str]:
+        """Process a candidate's answer, yielding the analysis as it streams in.
+        
+        The state is updated in place once the stream has been consumed.
+        """
+        state['candidate_response'] = answer
+        
+        state = self.workflow_manager._retrieve_context(state)
+        
+        chunks = []
+        for chunk in self.analyzer.analyze_response_stream(
+            state['current_question'],
+            state['candidate_response'],
+            state['rag_context'],
+            state['conversation_history']
+        ):
+            chunks.append(chunk)
+            yield chunk
+        state['current_analysis'] = "".join(chunks)
+        
+        self.workflow_manager._take_notes(state)
+    
     def generate_final_report(self, state: InterviewState) -> InterviewState:
         """Generate the final interview report"""
-        return self.workflow_manager._generate_report(state)
\ No newline at end of file
+        return self.workflow_manager._generate_report(state)
+    
+    def generate_final_report_stream(self, state: InterviewState) -> Iterator[str]:
+        """Generate the final report, yielding it as it streams in.
+        
+        The state is updated in place once the stream has been consumed.
+        """
+        chunks = []
+        for chunk in self.report_generator.generate_report_stream(
+            *self.workflow_manager._report_excerpts(state),
+            state['interview_notes']
+        ):
+            chunks.append(chunk)
+            yield chunk
+        state['interview_report'] = "".join(chunks)
+        state['is_complete'] = True
\ No newline at end of file
@@ -1,4 +1,5 @@
-from typing import List, Dict, Any, TypedDict
+import operator
+from typing import Annotated, List, Dict, Any, TypedDict
 from dataclasses import dataclass, field
 from datetime import datetime
 
@@ -6,11 +7,17 @@ from datetime import datetime
 class InterviewState(TypedDict):
     resume_content: str
     job_description: str
+    # Truncated once at ingest for the report prompt (ReportGenerator.prompt_excerpts)
+    resume_for_prompt: str
+    job_description_for_prompt: str
     interview_plan: List[Dict[str, Any]]
+    # Each planned question's category, by index, filled in with the plan
+    categories: List[str]
     current_question_idx: int
     current_question: str
     candidate_response: str
-    interview_notes: List[Dict[str, Any]]
+    # Concatenated when the workflow fans out over questions; a plain list everywhere else
+    interview_notes: Annotated[List[Dict[str, Any]], operator.add]
     conversation_history: List[Dict[str, str]]
     interview_report: str
     rag_context: str
@@ -34,7 +41,7 @@ class InterviewNote:
     observations: str
     relevant_skills: List[str]
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class InterviewConfig:
     """Configuration for interview settings"""
     max_questions: int = 5
@@ -44,3 +51,4 @@ class InterviewConfig:
     temperature: float = 0.3
     model_name: str = "gpt-4.1-nano-2025-04-14"
     index_path: str = "./interview_faiss_index"
+    index_type: str = "flat"  # "flat", "hnsw" or "ivf"; see RAGSystem.create_index
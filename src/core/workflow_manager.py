@@ -1,45 +1,56 @@
+import asyncio
+import functools
+from typing import Any, Dict, List, Tuple, Union, cast
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph, END
+from langgraph.types import Send
+from src.components.report_generator import ReportGenerator
 from src.core.models import InterviewState
 
+# Planned questions processed at once by the fanned-out workflow, to stay under API rate limits
+MAX_CONCURRENT_QUESTIONS = 4
+
 class InterviewWorkflowManager:
     """Manages the LangGraph workflow for interviews"""
     
     def __init__(self, interview_system):
         self.interview_system = interview_system
-        self.graph = self._build_graph()
     
-    def _build_graph(self) -> StateGraph:
-        """Build the LangGraph workflow"""
+    @property
+    def graph(self):
+        """The compiled workflow, shared by every manager"""
+        return self._compiled_graph()
+    
+    @classmethod
+    @functools.cache
+    def _compiled_graph(cls):
+        """Build and compile the LangGraph workflow once, on first use.
+        
+        The topology is the same for every manager, so nodes are unbound and find the
+        manager to run against in config["configurable"]["workflow_manager"].
+        """
         workflow = StateGraph(InterviewState)
         
-        # Add nodes
-        workflow.add_node("document_processor", self._process_documents)
-        workflow.add_node("planner", self._create_interview_plan)
-        workflow.add_node("question_generator", self._generate_next_question)
-        workflow.add_node("response_analyzer", self._analyze_response)
-        workflow.add_node("note_taker", self._take_notes)
-        workflow.add_node("report_generator", self._generate_report)
-        workflow.add_node("rag_retriever", self._retrieve_context)
+        # Add nodes; the graph runs under ainvoke, so the I/O-bound ones are async
+        workflow.add_node("document_processor", _document_processor_node)
+        workflow.add_node("planner", _planner_node)
+        workflow.add_node("question_worker", _question_worker_node)
+        workflow.add_node("report_generator", _report_generator_node)
         
         # Define the flow
         workflow.set_entry_point("document_processor")
         
         workflow.add_edge("document_processor", "planner")
-        workflow.add_edge("planner", "question_generator")
-        workflow.add_edge("question_generator", "rag_retriever")
-        workflow.add_edge("rag_retriever", "response_analyzer")
-        workflow.add_edge("response_analyzer", "note_taker")
         
-        # Conditional routing
+        # Fan out: every planned question is retrieved for and analyzed in the same super-step,
+        # so their LLM calls overlap; notes are merged by the interview_notes reducer
         workflow.add_conditional_edges(
-            "note_taker",
-            self._should_continue_interview,
-            {
-                "continue": "question_generator",
-                "complete": "report_generator",
-            }
+            "planner",
+            cls._continue_to_questions,
+            ["question_worker", "report_generator"]
         )
         
+        workflow.add_edge("question_worker", "report_generator")
         workflow.add_edge("report_generator", END)
         
         return workflow.compile()
@@ -49,26 +60,75 @@ class InterviewWorkflowManager:
         print("📄 Processing documents...")
         
         # Initialize basic state if not already set
-        if not state.get('conversation_history'):
-            state['conversation_history'] = []
-        if not state.get('interview_notes'):
-            state['interview_notes'] = []
-        if not state.get('current_question_idx'):
-            state['current_question_idx'] = 0
+        state.setdefault('conversation_history', [])
+        state.setdefault('interview_notes', [])
+        state.setdefault('current_question_idx', 0)
         
         state['next_action'] = 'plan'
         return state
     
-    def _create_interview_plan(self, state: InterviewState) -> InterviewState:
+    def _create_interview_plan(self, state: InterviewState, on_first_question=None) -> InterviewState:
         """Create interview plan using the interview system"""
         interview_plan = self.interview_system.planner.create_interview_plan(
             state['resume_content'], 
-            state['job_description']
+            state['job_description'],
+            on_first_question=on_first_question
         )
         state['interview_plan'] = interview_plan
+        state['categories'] = [q.get('category', 'general') for q in interview_plan]
         state['next_action'] = 'generate_question'
         return state
     
+    async def _acreate_interview_plan(self, state: InterviewState) -> Dict[str, Any]:
+        """Async planner node; planning streams synchronously, so it runs in a worker thread"""
+        interview_plan = await asyncio.to_thread(
+            self.interview_system.planner.create_interview_plan,
+            state['resume_content'],
+            state['job_description']
+        )
+        # One embedding request and one FAISS search for the whole plan, so each
+        # question_worker only looks up its precomputed context
+        await asyncio.to_thread(
+            self.interview_system.rag_system.warm_question_contexts,
+            {q['question']: q.get('retrieval_query') or q['question'] for q in interview_plan}
+        )
+        return {
+            'interview_plan': interview_plan,
+            'categories': [q.get('category', 'general') for q in interview_plan],
+            'next_action': 'generate_question'
+        }
+    
+    @staticmethod
+    def _continue_to_questions(state: InterviewState) -> Union[List[Send], str]:
+        """Send each planned question to its own question_worker, or go straight to the report"""
+        if not state['interview_plan']:
+            return "report_generator"
+        return [
+            Send("question_worker", {
+                'question': planned,
+                'candidate_response': state.get('candidate_response', '')
+            })
+            for planned in state['interview_plan']
+        ]
+    
+    async def _aprocess_planned_question(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        """Retrieve context for, analyze and take notes on one planned question"""
+        question = task['question']['question']
+        response = task['candidate_response']
+        if not response:
+            return {'interview_notes': []}
+        # The plan's retrieval query is already searched in advance; this adds what the answer is about
+        search_query = f"{question} {response}"
+        
+        rag_context = await asyncio.to_thread(
+            self.interview_system.rag_system.get_question_context, question, search_query
+        )
+        analysis = await self.interview_system.analyzer.aanalyze_response(question, response, rag_context, [])
+        note = self.interview_system.analyzer.create_interview_note(
+            question, response, analysis, task['question'].get('category', 'general')
+        )
+        return {'interview_notes': [note]}
+    
     def _generate_next_question(self, state: InterviewState) -> InterviewState:
         """Generate the next interview question"""
         print(f"❓ Generating question {state['current_question_idx'] + 1}...")
@@ -84,12 +144,20 @@ class InterviewWorkflowManager:
         print(f"Next question: {state['current_question']}")
         return state
     
-    def _retrieve_context(self, state: InterviewState) -> InterviewState:
+    def _retrieve_context(self, state: InterviewState, announce: bool = True) -> InterviewState:
         """Retrieve relevant context using RAG"""
-        print("🔍 Retrieving relevant context...")
+        # Analysis is skipped without a response, so the context would go unused
+        if not state.get('candidate_response'):
+            state['rag_context'] = ''
+            return state
+        
+        if announce:
+            print("🔍 Retrieving relevant context...")
         
         search_query = f"{state['current_question']} {state.get('candidate_response', '')}"
-        state['rag_context'] = self.interview_system.rag_system.get_context(search_query)
+        state['rag_context'] = self.interview_system.rag_system.get_question_context(
+            state['current_question'], search_query
+        )
         
         return state
     
@@ -108,19 +176,23 @@ class InterviewWorkflowManager:
         state['current_analysis'] = analysis
         return state
     
-    def _take_notes(self, state: InterviewState) -> InterviewState:
+    def _take_notes(self, state: InterviewState, announce: bool = True) -> InterviewState:
         """Take structured notes on the interview exchange"""
-        print("📝 Taking notes...")
+        if announce:
+            print("📝 Taking notes...")
         
         if not state.get('candidate_response'):
             return state
         
-        # Create interview note
+        # Create interview note; categories is missing only from states saved before it existed
+        idx = state['current_question_idx']
+        category = (state['categories'][idx] if 'categories' in state
+                    else state['interview_plan'][idx].get('category', 'general'))
         note = self.interview_system.analyzer.create_interview_note(
             state['current_question'],
             state['candidate_response'],
             state.get('current_analysis', ''),
-            state['interview_plan'][state['current_question_idx']].get('category', 'general')
+            category
         )
         
         state['interview_notes'].append(note)
@@ -136,17 +208,10 @@ class InterviewWorkflowManager:
         
         return state
     
-    def _should_continue_interview(self, state: InterviewState) -> str:
-        """Determine if interview should continue"""
-        if state['current_question_idx'] >= len(state['interview_plan']):
-            return "complete"
-        return "continue"
-    
     def _generate_report(self, state: InterviewState) -> InterviewState:
         """Generate comprehensive interview report"""
         report = self.interview_system.report_generator.generate_report(
-            state['resume_content'],
-            state['job_description'],
+            *self._report_excerpts(state),
             state['interview_notes']
         )
         
@@ -155,6 +220,62 @@ class InterviewWorkflowManager:
         
         return state
     
+    async def _agenerate_report(self, state: InterviewState) -> Dict[str, Any]:
+        """Async report node; returns only the fields it sets, as notes are merged by a reducer"""
+        report = await self.interview_system.report_generator.agenerate_report(
+            *self._report_excerpts(state),
+            state['interview_notes']
+        )
+        return {'interview_report': report, 'is_complete': True}
+    
+    def _report_excerpts(self, state: InterviewState) -> Tuple[str, str]:
+        """Report prompt excerpts, truncating here only for states created before they were stored"""
+        if 'resume_for_prompt' in state:
+            return state['resume_for_prompt'], state['job_description_for_prompt']
+        return ReportGenerator.prompt_excerpts(state['resume_content'], state['job_description'])
+    
     def execute_workflow(self, initial_state: InterviewState) -> InterviewState:
         """Execute the complete interview workflow"""
-        return self.graph.invoke(initial_state)
+        return asyncio.run(self.aexecute_workflow(initial_state))
+    
+    async def aexecute_workflow(self, initial_state: InterviewState) -> InterviewState:
+        """Execute the complete interview workflow on the event loop, using the async node variants"""
+        return await self.graph.ainvoke(initial_state, config={
+            "max_concurrency": MAX_CONCURRENT_QUESTIONS,
+            "configurable": {"workflow_manager": self}
+        })
+
+
+def _manager(config: RunnableConfig) -> InterviewWorkflowManager:
+    """The manager a run of the shared graph belongs to"""
+    return config["configurable"]["workflow_manager"]
+
+
+def _document_processor_node(state: InterviewState, config: RunnableConfig) -> Dict[str, Any]:
+    """Graph node for InterviewWorkflowManager._process_documents, returning only the keys it sets.
+
+    interview_notes is merged with operator.add, so handing back the whole state would append
+    any notes already in it a second time.
+    """
+    state = _manager(config)._process_documents(cast(InterviewState, dict(state)))
+    return {
+        'conversation_history': state['conversation_history'],
+        'interview_notes': [],
+        'current_question_idx': state['current_question_idx'],
+        'next_action': state['next_action']
+    }
+
+
+async def _planner_node(state: InterviewState, config: RunnableConfig) -> Dict[str, Any]:
+    """Graph node for InterviewWorkflowManager._acreate_interview_plan"""
+    return await _manager(config)._acreate_interview_plan(state)
+
+
+async def _question_worker_node(task: Dict[str, Any], config: RunnableConfig) -> Dict[str, Any]:
+    """Graph node for InterviewWorkflowManager._aprocess_planned_question"""
+    return await _manager(config)._aprocess_planned_question(task)
+
+
+async def _report_generator_node(state: InterviewState, config: RunnableConfig) -> Dict[str, Any]:
+    """Graph node for InterviewWorkflowManager._agenerate_report"""
+    return await _manager(config)._agenerate_report(state)
@@ -0,0 +1,5 @@
+-- Record when a session's final report was generated so it is never regenerated for that session.
+-- Apply before (re)creating save_session_and_report, which sets this column.
+
+alter table public.interview_sessions
+    add column if not exists report_generated_at timestamptz;
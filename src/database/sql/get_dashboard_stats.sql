@@ -0,0 +1,25 @@
+-- Everything the dashboard shows in one round trip: the user's aggregates from the
+-- user_session_stats view plus their 10 most recent sessions.
+-- Called from SupabaseManager.get_user_dashboard_stats via rpc('get_dashboard_stats', ...).
+-- Runs as the calling user so the existing row-level security policies still apply.
+
+create or replace function public.get_dashboard_stats(p_user uuid)
+returns jsonb
+language sql
+stable
+security invoker
+as $$
+    select coalesce(
+        (select to_jsonb(s) - 'user_id' from public.user_session_stats s where s.user_id = p_user),
+        '{}'::jsonb
+    ) || jsonb_build_object('sessions', coalesce((
+        select jsonb_agg(r order by r.created_at desc)
+        from (
+            select id, status, average_score, total_questions, created_at, title
+            from public.interview_sessions
+            where user_id = p_user
+            order by created_at desc
+            limit 10
+        ) r
+    ), '[]'::jsonb));
+$$;
@@ -0,0 +1,28 @@
+-- Return a user's settings row, creating it with the defaults on first use, in one round trip.
+-- Called from SupabaseManager.get_user_settings via rpc('get_or_create_user_settings', ...).
+-- Relies on the unique index on user_settings(user_id) (see user_created_indexes).
+-- Runs as the calling user so the existing row-level security policies still apply.
+
+create or replace function public.get_or_create_user_settings(p_user_id uuid, p_defaults jsonb)
+returns jsonb
+language plpgsql
+security invoker
+as $$
+declare
+    v_settings jsonb;
+begin
+    insert into user_settings (user_id, max_questions, model_name, temperature, chunk_size, chunk_overlap)
+    values (
+        p_user_id,
+        (p_defaults->>'max_questions')::int,
+        p_defaults->>'model_name',
+        (p_defaults->>'temperature')::numeric,
+        (p_defaults->>'chunk_size')::int,
+        (p_defaults->>'chunk_overlap')::int
+    )
+    on conflict (user_id) do nothing;
+
+    select to_jsonb(s) into v_settings from user_settings s where s.user_id = p_user_id;
+    return v_settings;
+end;
+$$;
@@ -0,0 +1,17 @@
+-- Which of the given public tables the calling user can access, in one round trip.
+-- Called from SupabaseManager.test_connection via rpc('probe_schema', ...).
+-- information_schema only lists tables the current role has privileges on.
+
+create or replace function public.probe_schema(p_tables text[])
+returns text[]
+language sql
+stable
+security invoker
+as $$
+    select array(
+        select t.table_name::text
+        from information_schema.tables t
+        where t.table_schema = 'public' and t.table_name = any(p_tables)
+        order by array_position(p_tables, t.table_name::text)
+    );
+$$;
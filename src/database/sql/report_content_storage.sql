@@ -0,0 +1,18 @@
+-- Keep report bodies in Storage (gzipped) and only their path on interview_reports.
+-- Rows written before this change keep their inline report_content.
+
+alter table public.interview_reports
+    add column if not exists content_path text;
+
+alter table public.interview_reports
+    alter column report_content drop not null;
+
+insert into storage.buckets (id, name, public)
+values ('reports', 'reports', false)
+on conflict (id) do nothing;
+
+-- Objects are stored as <user_id>/<report key>.md.gz; users may only touch their own folder
+create policy "Users manage their own report files"
+on storage.objects for all to authenticated
+using (bucket_id = 'reports' and (storage.foldername(name))[1] = auth.uid()::text)
+with check (bucket_id = 'reports' and (storage.foldername(name))[1] = auth.uid()::text);
@@ -0,0 +1,77 @@
+-- Persist the final interview session state and its report in one transaction.
+-- Called from SupabaseManager.save_session_and_report via rpc('save_session_and_report', ...).
+-- Runs as the calling user so the existing row-level security policies still apply.
+-- The client leaves final_report out of p_session (it is p_report's report_content) and,
+-- for an existing session, omits the resume/job description that the row already holds.
+
+create or replace function public.save_session_and_report(
+    p_user_id uuid,
+    p_session_id uuid,
+    p_session jsonb,
+    p_report jsonb
+) returns jsonb
+language plpgsql
+security invoker
+as $$
+declare
+    v_session_id uuid := p_session_id;
+    v_report_id uuid;
+begin
+    if v_session_id is null then
+        insert into interview_sessions (
+            user_id, title, status, interview_plan, current_question_idx, interview_notes,
+            conversation_history, resume_content, job_description, total_questions,
+            average_score, final_report, report_generated_at, created_at
+        ) values (
+            p_user_id,
+            p_session->>'title',
+            coalesce(p_session->>'status', 'completed'),
+            coalesce(p_session->'interview_plan', '[]'::jsonb),
+            coalesce((p_session->>'current_question_idx')::int, 0),
+            coalesce(p_session->'interview_notes', '[]'::jsonb),
+            coalesce(p_session->'conversation_history', '[]'::jsonb),
+            coalesce(p_session->>'resume_content', ''),
+            coalesce(p_session->>'job_description', ''),
+            coalesce((p_session->>'total_questions')::int, 0),
+            (p_session->>'average_score')::numeric,
+            coalesce(p_session->>'final_report', p_report->>'report_content', ''),
+            now(),
+            now()
+        )
+        returning id into v_session_id;
+    else
+        update interview_sessions set
+            title = coalesce(p_session->>'title', title),
+            status = coalesce(p_session->>'status', status),
+            interview_plan = coalesce(p_session->'interview_plan', interview_plan),
+            current_question_idx = coalesce((p_session->>'current_question_idx')::int, current_question_idx),
+            interview_notes = coalesce(p_session->'interview_notes', interview_notes),
+            conversation_history = coalesce(p_session->'conversation_history', conversation_history),
+            resume_content = coalesce(p_session->>'resume_content', resume_content),
+            job_description = coalesce(p_session->>'job_description', job_description),
+            total_questions = coalesce((p_session->>'total_questions')::int, total_questions),
+            average_score = coalesce((p_session->>'average_score')::numeric, average_score),
+            final_report = coalesce(p_session->>'final_report', p_report->>'report_content', final_report),
+            report_generated_at = now(),
+            updated_at = now()
+        where id = v_session_id and user_id = p_user_id;
+    end if;
+
+    insert into interview_reports (
+        user_id, session_id, title, report_content, content_path, summary, scores, recommendations, created_at
+    ) values (
+        p_user_id,
+        v_session_id,
+        p_report->>'title',
+        p_report->>'report_content',
+        p_report->>'content_path',
+        coalesce(p_report->'summary', '{}'::jsonb),
+        coalesce(p_report->'scores', '{}'::jsonb),
+        coalesce(p_report->>'recommendations', ''),
+        now()
+    )
+    returning id into v_report_id;
+
+    return jsonb_build_object('session_id', v_session_id, 'report_id', v_report_id);
+end;
+$$;
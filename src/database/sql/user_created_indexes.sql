@@ -0,0 +1,14 @@
+-- Indexes for the per-user lists ordered by newest first (sessions, reports, dashboard),
+-- so they are an index range scan instead of a filter and sort over the whole table,
+-- and a unique index on user_settings.user_id for the settings upsert.
+-- CONCURRENTLY avoids locking writes while building; it cannot run inside a transaction,
+-- so run each statement on its own in the SQL editor.
+
+create index concurrently if not exists idx_sessions_user_created
+    on public.interview_sessions (user_id, created_at desc);
+
+create index concurrently if not exists idx_reports_user_created
+    on public.interview_reports (user_id, created_at desc);
+
+create unique index concurrently if not exists idx_user_settings_user
+    on public.user_settings (user_id);
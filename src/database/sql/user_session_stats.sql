@@ -0,0 +1,17 @@
+-- Per-user dashboard aggregates, so the dashboard reads one row instead of every session.
+-- security_invoker keeps the interview_sessions row-level security in force.
+
+create or replace view public.user_session_stats
+with (security_invoker = true) as
+select
+    user_id,
+    count(*) as total_sessions,
+    count(*) filter (where status = 'completed') as completed_sessions,
+    count(*) filter (where status = 'in_progress') as in_progress_sessions,
+    case when count(*) filter (where status = 'completed') > 0
+         then coalesce(round(avg(average_score)::numeric, 1), 0) else 0 end as overall_avg_score,
+    case when count(*) filter (where status = 'completed') > 0
+         then coalesce(sum(total_questions), 0) else 0 end as total_questions_answered,
+    count(*) filter (where created_at >= now() - interval '30 days') as recent_activity
+from public.interview_sessions
+group by user_id;
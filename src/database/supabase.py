@@ -1,8 +1,9 @@
 import os
 from typing import Dict, List, Optional, Any
-from datetime import datetime
-import json
-from supabase import create_client, Client
+from datetime import datetime, timezone
+import gzip
+import uuid
+from supabase import create_client, Client, ClientOptions
 from dataclasses import asdict
 import streamlit as st
 import logging
@@ -11,6 +12,15 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Storage bucket holding gzipped report bodies, so interview_reports rows stay small
+REPORTS_BUCKET = 'reports'
+# Everything the dashboard needs to list and show a report except the report body itself
+REPORT_LIST_COLUMNS = 'id, user_id, session_id, title, summary, scores, recommendations, content_path, created_at'
+# Session columns for list views; the plan, notes, documents and report stay with the full row
+SESSION_LIST_COLUMNS = 'id, title, status, average_score, total_questions, current_question_idx, created_at, updated_at'
+# Request timeout for the database and storage clients, in seconds
+SUPABASE_CLIENT_TIMEOUT_S = float(os.getenv("SUPABASE_CLIENT_TIMEOUT_S", "10"))
+
 class SupabaseManager:
     """Handles all Supabase database operations with improved error handling"""
     
@@ -23,7 +33,12 @@ class SupabaseManager:
             raise ValueError("SUPABASE_URL and SUPABASE_ANON_KEY must be set in environment variables")
         
         try:
-            self.client: Client = create_client(self.supabase_url, self.supabase_key)
+            # One client per manager: it carries the signed-in user's auth, so it can't be shared
+            # across sessions. Its HTTP/2 connections are kept alive and reused for every call.
+            self.client: Client = create_client(self.supabase_url, self.supabase_key, options=ClientOptions(
+                postgrest_client_timeout=SUPABASE_CLIENT_TIMEOUT_S,
+                storage_client_timeout=SUPABASE_CLIENT_TIMEOUT_S
+            ))
         except Exception as e:
             logger.error(f"Failed to create Supabase client: {e}")
             raise
@@ -99,7 +114,7 @@ class SupabaseManager:
         """Update user profile"""
         try:
             # Add updated_at timestamp
-            profile_data['updated_at'] = datetime.now().isoformat()
+            profile_data['updated_at'] = datetime.now(timezone.utc).isoformat()
             
             response = self.client.table('profiles').update(profile_data).eq('id', user_id).execute()
             return len(response.data) > 0
@@ -108,23 +123,20 @@ class SupabaseManager:
             return False
     
     def get_user_settings(self, user_id: str) -> Optional[Dict[str, Any]]:
-        """Get user settings"""
+        """Get user settings, creating the defaults on first use (see sql/get_or_create_user_settings.sql)"""
         try:
-            response = self.client.table('user_settings').select('*').eq('user_id', user_id).execute()
-            if response.data:
-                return response.data[0]
-            else:
-                # Create default settings if none exist
-                default_settings = {
-                    'user_id': user_id,
-                    'max_questions': 5,
-                    'model_name': 'gpt-4o-mini',
-                    'temperature': 0.3,
-                    'chunk_size': 500,
-                    'chunk_overlap': 50
-                }
-                self.client.table('user_settings').insert(default_settings).execute()
-                return default_settings
+            default_settings = {
+                'max_questions': 5,
+                'model_name': 'gpt-4o-mini',
+                'temperature': 0.3,
+                'chunk_size': 500,
+                'chunk_overlap': 50
+            }
+            response = self.client.rpc('get_or_create_user_settings', {
+                'p_user_id': user_id,
+                'p_defaults': default_settings
+            }).execute()
+            return response.data or {'user_id': user_id, **default_settings}
         except Exception as e:
             logger.error(f"Error fetching user settings: {e}")
             # Return default settings on error
@@ -138,18 +150,14 @@ class SupabaseManager:
     
     def update_user_settings(self, user_id: str, settings: Dict[str, Any]) -> bool:
         """Update user settings with better error handling"""
+        now = datetime.now(timezone.utc).isoformat()
         try:
             # Add timestamps
-            settings['updated_at'] = datetime.now().isoformat()
+            settings['updated_at'] = now
             
-            # Try to update first
-            response = self.client.table('user_settings').update(settings).eq('user_id', user_id).execute()
-            
-            # If no rows affected, insert new settings
-            if not response.data:
-                settings['user_id'] = user_id
-                settings['created_at'] = datetime.now().isoformat()
-                response = self.client.table('user_settings').insert(settings).execute()
+            # Update the row, or create it if the user has none, in one call
+            settings['user_id'] = user_id
+            response = self.client.table('user_settings').upsert(settings, on_conflict='user_id').execute()
             
             return len(response.data) > 0
         except Exception as e:
@@ -159,20 +167,21 @@ class SupabaseManager:
                 minimal_settings = {
                     'user_id': user_id,
                     'max_questions': settings.get('max_questions', 5),
-                    'updated_at': datetime.now().isoformat()
+                    'updated_at': now
                 }
-                response = self.client.table('user_settings').upsert(minimal_settings).execute()
+                response = self.client.table('user_settings').upsert(minimal_settings, on_conflict='user_id').execute()
                 return len(response.data) > 0
             except:
                 return False
     
     def create_interview_session(self, user_id: str, session_data: Dict[str, Any]) -> Optional[str]:
         """Create a new interview session with improved error handling"""
+        now = datetime.now(timezone.utc)
         try:
             # Prepare session data with required fields
             safe_session_data = {
                 'user_id': user_id,
-                'title': session_data.get('title', f"Interview Session {datetime.now().strftime('%Y-%m-%d %H:%M')}"),
+                'title': session_data.get('title', f"Interview Session {now.strftime('%Y-%m-%d %H:%M')}"),
                 'status': session_data.get('status', 'in_progress'),
                 'interview_plan': session_data.get('interview_plan', []),
                 'current_question_idx': session_data.get('current_question_idx', 0),
@@ -183,7 +192,7 @@ class SupabaseManager:
                 'total_questions': session_data.get('total_questions', 0),
                 'average_score': session_data.get('average_score'),
                 'final_report': session_data.get('final_report', ''),
-                'created_at': datetime.now().isoformat()
+                'created_at': now.isoformat()
             }
             
             response = self.client.table('interview_sessions').insert(safe_session_data).execute()
@@ -195,7 +204,7 @@ class SupabaseManager:
                 minimal_data = {
                     'user_id': user_id,
                     'status': 'in_progress',
-                    'created_at': datetime.now().isoformat()
+                    'created_at': now.isoformat()
                 }
                 response = self.client.table('interview_sessions').insert(minimal_data).execute()
                 return response.data[0]['id'] if response.data else None
@@ -207,7 +216,7 @@ class SupabaseManager:
         try:
             # Prepare safe update data
             safe_session_data = {
-                'updated_at': datetime.now().isoformat()
+                'updated_at': datetime.now(timezone.utc).isoformat()
             }
             
             # Only include fields that exist in the schema
@@ -236,7 +245,7 @@ class SupabaseManager:
             return False
     
     def get_interview_session(self, session_id: str) -> Optional[Dict[str, Any]]:
-        """Get interview session by ID"""
+        """Get the full interview session row by ID"""
         try:
             response = self.client.table('interview_sessions').select('*').eq('id', session_id).execute()
             return response.data[0] if response.data else None
@@ -244,11 +253,28 @@ class SupabaseManager:
             logger.error(f"Error fetching interview session: {e}")
             return None
     
+    def get_session_report_status(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Get when a session's final report was generated, with the report text and saved report id"""
+        try:
+            response = (self.client.table('interview_sessions')
+                       .select('report_generated_at, final_report, interview_reports(id)')
+                       .eq('id', session_id)
+                       .execute())
+            if not response.data:
+                return None
+            row = response.data[0]
+            reports = row.pop('interview_reports', None) or []
+            row['report_id'] = reports[0]['id'] if reports else None
+            return row
+        except Exception as e:
+            logger.error(f"Error fetching session report status: {e}")
+            return None
+    
     def get_user_interview_sessions(self, user_id: str, limit: int = 50) -> List[Dict[str, Any]]:
-        """Get all interview sessions for a user"""
+        """Get a user's interview sessions for listing (SESSION_LIST_COLUMNS; see get_interview_session)"""
         try:
             response = (self.client.table('interview_sessions')
-                       .select('*')
+                       .select(SESSION_LIST_COLUMNS)
                        .eq('user_id', user_id)
                        .order('created_at', desc=True)
                        .limit(limit)
@@ -267,8 +293,20 @@ class SupabaseManager:
             logger.error(f"Error deleting interview session: {e}")
             return False
     
+    def delete_interview_sessions(self, session_ids: List[str]) -> int:
+        """Delete several interview sessions in one request; returns how many were deleted"""
+        if not session_ids:
+            return 0
+        try:
+            response = self.client.table('interview_sessions').delete().in_('id', session_ids).execute()
+            return len(response.data)
+        except Exception as e:
+            logger.error(f"Error deleting interview sessions: {e}")
+            return 0
+    
     def save_interview_report(self, user_id: str, session_id: Optional[str], report_data: Dict[str, Any]) -> Optional[str]:
         """Save an interview report"""
+        now = datetime.now(timezone.utc)
         try:
             # Ensure report_content is provided as it's NOT NULL in the schema
             report_content = report_data.get('report_content', '')
@@ -281,12 +319,12 @@ class SupabaseManager:
             safe_report_data = {
                 'user_id': user_id,
                 'session_id': session_id, # This will be None if session_id is None
-                'title': report_data.get('title', f"Interview Report {datetime.now().strftime('%Y-%m-%d %H:%M')}"),
+                'title': report_data.get('title', f"Interview Report {now.strftime('%Y-%m-%d %H:%M')}"),
                 'report_content': report_content, # report_content must be non-empty
                 'summary': report_data.get('summary', {}), # Default to empty dict for JSONB
                 'scores': report_data.get('scores', {}),   # Default to empty dict for JSONB
                 'recommendations': report_data.get('recommendations', ''),
-                'created_at': datetime.now().isoformat()
+                'created_at': now.isoformat()
                 # updated_at is handled by a database trigger
             }
             
@@ -305,6 +343,57 @@ class SupabaseManager:
             logger.error(f"Exception in save_interview_report: {e}")
             return None
     
+    def save_session_and_report(self, user_id: str, session_id: Optional[str],
+                                session_data: Dict[str, Any], report_data: Dict[str, Any]) -> Optional[Dict[str, str]]:
+        """Save the final session state and its report in a single transaction.
+
+        Uses the `save_session_and_report` Postgres function (see sql/save_session_and_report.sql).
+        Returns a dict with the `session_id` and `report_id`, or None on failure.
+        """
+        try:
+            if not report_data.get('report_content'):
+                logger.error("Attempted to save report with empty content.")
+                return None
+
+            # Trim fields the function can fill in itself so the report text is only sent once
+            session_payload = {k: v for k, v in session_data.items() if k != 'final_report'}
+            if session_id:
+                # Already stored on the existing session row
+                session_payload.pop('resume_content', None)
+                session_payload.pop('job_description', None)
+
+            report_payload = {
+                'title': report_data.get('title', f"Interview Report {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M')}"),
+                'summary': report_data.get('summary', {}),
+                'scores': report_data.get('scores', {}),
+                'recommendations': report_data.get('recommendations', '')
+            }
+            # A fresh key per report, so cleaning up one report's body never touches another's
+            content_path = self.upload_report_content(user_id, uuid.uuid4().hex, report_data['report_content'])
+            if content_path:
+                report_payload['content_path'] = content_path
+                session_payload['final_report'] = report_data['report_content']
+            else:
+                # Fall back to storing the body inline on the report row
+                report_payload['report_content'] = report_data['report_content']
+
+            response = None
+            try:
+                response = self.client.rpc('save_session_and_report', {
+                    'p_user_id': user_id,
+                    'p_session_id': session_id,
+                    'p_session': session_payload,
+                    'p_report': report_payload
+                }).execute()
+            finally:
+                # No report row points at the uploaded body unless the transaction went through
+                if content_path and not (response and response.data):
+                    self._remove_report_content([content_path])
+            return response.data if response.data else None
+        except Exception as e:
+            logger.error(f"Error saving session and report: {e}")
+            return None
+
     def get_user_reports(self, user_id: str, limit: int = 50) -> List[Dict[str, Any]]:
         """Get all reports for a user"""
         try:
@@ -319,6 +408,57 @@ class SupabaseManager:
             logger.error(f"Error fetching user reports: {e}")
             return []
     
+    def get_user_reports_full(self, user_id: str, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+        """Get a page of a user's reports, newest first, with everything but the report body (see get_report_content)"""
+        try:
+            response = (self.client.table('interview_reports')
+                       .select(REPORT_LIST_COLUMNS)
+                       .eq('user_id', user_id)
+                       .order('created_at', desc=True)
+                       .range(offset, offset + limit - 1)
+                       .execute())
+            return response.data if response.data else []
+        except Exception as e:
+            logger.error(f"Error fetching full user reports: {e}")
+            return []
+    
+    def upload_report_content(self, user_id: str, report_key: str, content: str) -> Optional[str]:
+        """Upload a gzipped report body to Storage and return its path, or None on failure"""
+        path = f"{user_id}/{report_key}.md.gz"
+        try:
+            self.client.storage.from_(REPORTS_BUCKET).upload(
+                path,
+                gzip.compress(content.encode('utf-8')),
+                {'content-type': 'application/gzip', 'upsert': 'true'}
+            )
+            return path
+        except Exception as e:
+            logger.error(f"Error uploading report content: {e}")
+            return None
+    
+    def _remove_report_content(self, content_paths: List[str]) -> None:
+        """Delete report bodies from Storage; a failure only leaves an unreferenced object behind"""
+        if not content_paths:
+            return
+        try:
+            self.client.storage.from_(REPORTS_BUCKET).remove(content_paths)
+        except Exception as e:
+            logger.error(f"Error removing report content: {e}")
+    
+    def get_report_content(self, report: Dict[str, Any]) -> str:
+        """Get a report's full body, from Storage when offloaded or from its row otherwise"""
+        try:
+            if report.get('content_path'):
+                data = self.client.storage.from_(REPORTS_BUCKET).download(report['content_path'])
+                return gzip.decompress(data).decode('utf-8')
+            if report.get('report_content'):
+                return report['report_content']
+            response = self.client.table('interview_reports').select('report_content').eq('id', report.get('id')).execute()
+            return (response.data[0].get('report_content') or '') if response.data else ''
+        except Exception as e:
+            logger.error(f"Error fetching report content: {e}")
+            return ''
+    
     def get_report(self, report_id: str) -> Optional[Dict[str, Any]]:
         """Get report by ID"""
         try:
@@ -332,47 +472,40 @@ class SupabaseManager:
         """Delete a report"""
         try:
             response = self.client.table('interview_reports').delete().eq('id', report_id).execute()
+            self._remove_report_content([row['content_path'] for row in response.data if row.get('content_path')])
             return len(response.data) > 0
         except Exception as e:
             logger.error(f"Error deleting report: {e}")
             return False
 
+    def delete_reports(self, report_ids: List[str]) -> int:
+        """Delete several reports in one request; returns how many were deleted"""
+        if not report_ids:
+            return 0
+        try:
+            response = self.client.table('interview_reports').delete().in_('id', report_ids).execute()
+            self._remove_report_content([row['content_path'] for row in response.data if row.get('content_path')])
+            return len(response.data)
+        except Exception as e:
+            logger.error(f"Error deleting reports: {e}")
+            return 0
+
     def get_user_dashboard_stats(self, user_id: str) -> Dict[str, Any]:
         """Get dashboard statistics for a user"""
         try:
-            # Get session stats
-            sessions_response = (self.client.table('interview_sessions')
-                               .select('id, status, average_score, total_questions, created_at, title')
-                               .eq('user_id', user_id)
-                               .execute())
-            
-            sessions = sessions_response.data
-            
-            # Calculate stats
-            total_sessions = len(sessions)
-            completed_sessions = len([s for s in sessions if s.get('status') == 'completed'])
-            
-            if completed_sessions > 0:
-                avg_scores = [s.get('average_score', 0) for s in sessions if s.get('average_score') is not None]
-                overall_avg_score = sum(avg_scores) / len(avg_scores) if avg_scores else 0
-                total_questions_answered = sum([s.get('total_questions', 0) for s in sessions if s.get('total_questions')])
-            else:
-                overall_avg_score = 0
-                total_questions_answered = 0
-            
-            # Get recent activity (last 30 days)
-            from datetime import datetime, timedelta
-            thirty_days_ago = (datetime.now() - timedelta(days=30)).isoformat()
-            recent_sessions = [s for s in sessions if s.get('created_at', '') >= thirty_days_ago]
+            # Aggregates from the user_session_stats view and the last 10 sessions for display,
+            # in one call (see sql/get_dashboard_stats.sql)
+            response = self.client.rpc('get_dashboard_stats', {'p_user': user_id}).execute()
+            stats = response.data or {}
             
             return {
-                'total_sessions': total_sessions,
-                'completed_sessions': completed_sessions,
-                'in_progress_sessions': len([s for s in sessions if s.get('status') == 'in_progress']),
-                'overall_avg_score': round(overall_avg_score, 1) if overall_avg_score else 0,
-                'total_questions_answered': total_questions_answered,
-                'recent_activity': len(recent_sessions),
-                'sessions': sessions[:10]  # Last 10 sessions for display
+                'total_sessions': stats.get('total_sessions', 0),
+                'completed_sessions': stats.get('completed_sessions', 0),
+                'in_progress_sessions': stats.get('in_progress_sessions', 0),
+                'overall_avg_score': stats.get('overall_avg_score') or 0,
+                'total_questions_answered': stats.get('total_questions_answered', 0),
+                'recent_activity': stats.get('recent_activity', 0),
+                'sessions': stats.get('sessions') or []
             }
         except Exception as e:
             logger.error(f"Error fetching dashboard stats: {e}")
@@ -392,16 +525,13 @@ class SupabaseManager:
             # Test basic connection
             user = self.get_current_user()
             
-            # Test table access
+            # Test table access, all tables in one call (see sql/probe_schema.sql)
             tables_to_test = ['profiles', 'user_settings', 'interview_sessions', 'interview_reports']
-            accessible_tables = []
-            
+            response = self.client.rpc('probe_schema', {'p_tables': tables_to_test}).execute()
+            accessible_tables = response.data or []
             for table in tables_to_test:
-                try:
-                    self.client.table(table).select('id').limit(1).execute()
-                    accessible_tables.append(table)
-                except Exception as e:
-                    logger.warning(f"Table {table} not accessible: {e}")
+                if table not in accessible_tables:
+                    logger.warning(f"Table {table} not accessible")
             
             return {
                 'success': True,
@@ -1,102 +1,46 @@
-PLANNING_PROMPT="""
-        You are an expert interview planner. Based on the resume and job description provided, 
-        create a comprehensive interview plan with exactly {number_of_questions} strategic questions.
-        
-        Resume Content:
-        {resume_content}
-        
-        Job Description:
-        {job_description}
-        
-        Create exactly {number_of_questions} questions that:
-        1. Assess technical skills mentioned in the job requirements
-        2. Evaluate experience relevant to the role
-        3. Test problem-solving abilities
-        4. Explore cultural fit and soft skills
-        5. Identify gaps or areas needing clarification
-        
-        IMPORTANT: Return EXACTLY {number_of_questions} questions, no more, no less.
-        
-        Return a JSON array of questions with this structure:
-        [
-            {{
-                "question": "specific question text",
-                "category": "technical|experience|behavioral|problem_solving",
-                "priority": 1-5,
-                "expected_skills": ["skill1", "skill2"],
-                "follow_up_prompts": ["follow up 1", "follow up 2"]
-            }}
-        ]
-        
-        Order questions by priority and natural flow. Ensure the array contains exactly {number_of_questions} questions.
-        """
+PLANNING_PROMPT="""You are an expert interviewer. Plan exactly {number_of_questions} interview questions for this candidate.
 
-ANALYSIS_PROMPT="""
-        Analyze this interview response in the context of the resume and job requirements.
-        
-        Question: {question}
-        Candidate Response: {response}
-        
-        Relevant Context from Resume/Job Description:
-        {rag_context}
-        
-        Previous Conversation:
-        {conversation_history}
-        
-        Provide analysis in this format:
-        SCORE: [1-10]
-        STRENGTHS: [key strengths demonstrated]
-        CONCERNS: [areas of concern or missing information]
-        FOLLOW_UP: [suggested follow-up questions if needed]
-        OBSERVATIONS: [detailed observations]
-        """
+Resume:
+{resume_content}
 
-REPORT_PROMPT="""
-        Generate a comprehensive interview report based on the following information:
-        
-        Resume Summary:
-        {resume_content}
-        
-        Job Requirements:
-        {job_description}
-        
-        Interview Notes:
-        {interview_notes}
-        
-        Generate a professional report with these sections:
-        
-        # INTERVIEW REPORT
-        
-        ## CANDIDATE OVERVIEW
-        [Brief summary of candidate background]
-        
-        ## INTERVIEW SUMMARY
-        [Overall interview performance and key highlights]
-        
-        ## DETAILED ASSESSMENT
-        
-        ### Technical Skills
-        [Assessment of technical capabilities]
-        
-        ### Experience Relevance
-        [How experience aligns with role requirements]
-        
-        ### Communication & Soft Skills
-        [Assessment of communication and interpersonal skills]
-        
-        ### Problem-Solving Ability
-        [Evaluation of analytical and problem-solving skills]
-        
-        ## STRENGTHS
-        [Key strengths identified]
-        
-        ## AREAS OF CONCERN
-        [Potential concerns or gaps]
-        
-        ## RECOMMENDATION
-        [Clear hiring recommendation with reasoning]
-        
-        ## OVERALL SCORE: [X/10]
-        
-        Make the report detailed, professional, and actionable for hiring decisions.
-        """
\ No newline at end of file
+Job description:
+{job_description}
+
+Cover the role's technical skills, relevant experience, problem solving, soft skills/cultural fit, and any gaps that need clarifying. Order by priority and natural flow.
+
+Return a JSON object whose "questions" array holds exactly {number_of_questions} objects:
+{{"questions": [{{"question": "...", "category": "technical|experience|behavioral|problem_solving", "priority": 1-5, "expected_skills": ["..."], "follow_up_prompts": ["..."], "retrieval_query": "short search phrase for the resume/job description passages the question is about"}}]}}
+"""
+
+ANALYSIS_PROMPT="""Analyze this interview response against the resume and job requirements.
+
+Question: {question}
+Response: {response}
+
+Resume/job context:
+{rag_context}
+
+Previous conversation:
+{conversation_history}
+
+Answer in exactly this format:
+SCORE: [1-10]
+STRENGTHS: ...
+CONCERNS: ...
+FOLLOW_UP: ...
+OBSERVATIONS: ...
+"""
+
+REPORT_PROMPT="""Write a professional, actionable interview report in markdown for a hiring decision.
+
+Resume:
+{resume_content}
+
+Job requirements:
+{job_description}
+
+Interview notes:
+{interview_notes}
+
+Start with "# INTERVIEW REPORT", then these ## sections in order: CANDIDATE OVERVIEW, INTERVIEW SUMMARY, DETAILED ASSESSMENT (### Technical Skills, ### Experience Relevance, ### Communication & Soft Skills, ### Problem-Solving Ability), STRENGTHS, AREAS OF CONCERN, RECOMMENDATION (clear hire/no-hire with reasoning), and finally "## OVERALL SCORE: X/10".
+"""
@@ -1,135 +1,205 @@
+import functools
+import gzip
+import io
 import os
-import json
-from typing import Dict, Any, List
-from datetime import datetime
+import re
+import sys
+import time
+import orjson
+from collections import Counter, defaultdict
+from typing import Dict, Any, List, NamedTuple
+
+# Score bars are sliced from this rather than built per line
+_BAR = "█" * 1024
+
+# How long a path existence check is reused, in seconds
+_EXISTS_TTL_S = 5
+
+# OpenAI key shape: 'sk-' followed by at least 37 non-whitespace characters
+_KEY_RE = re.compile(r"sk-\S{37,}")
 
 
 def validate_file_paths(*file_paths: str) -> bool:
     """Validate that all provided file paths exist"""
+    epoch = int(time.monotonic() / _EXISTS_TTL_S)
     for path in file_paths:
-        if not os.path.exists(path):
+        if not _exists(path, epoch):
             print(f"❌ File not found: {path}")
             return False
     return True
 
 
-def save_interview_session(state: Dict[str, Any], output_dir: str = "./interview_sessions") -> str:
-    """Save interview session to JSON file"""
+@functools.lru_cache(maxsize=256)
+def _exists(path: str, epoch: int) -> bool:
+    """os.path.exists, memoized per epoch so repeat checks within _EXISTS_TTL_S skip the stat"""
+    return os.path.exists(path)
+
+
+def save_interview_session(state: Dict[str, Any], output_dir: str = "./interview_sessions",
+                           pretty: bool = False, compress: bool = False) -> str:
+    """Save interview session to JSON file; compact unless pretty is set, as it is only machine-read.
+    
+    With compress, the file is gzipped (.json.gz), for sessions kept long-term.
+    """
     os.makedirs(output_dir, exist_ok=True)
     
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"interview_session_{timestamp}.json"
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
+    filename = f"interview_session_{timestamp}.json{'.gz' if compress else ''}"
     filepath = os.path.join(output_dir, filename)
     
-    # Convert state to JSON-serializable format
-    serializable_state = _make_json_serializable(state)
-    
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(serializable_state, f, indent=2, ensure_ascii=False)
+    # orjson encodes straight to UTF-8 bytes, written in one call.
+    # Values JSON can't represent are stored as their str() by the default hook
+    option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+    data = orjson.dumps(state, option=option, default=_coerce)
+    if compress:
+        data = gzip.compress(data, compresslevel=3)
+    # Written beside the target and renamed over it, so a crash never leaves a truncated session
+    tmp_path = f"{filepath}.tmp"
+    try:
+        with open(tmp_path, 'wb', buffering=1 << 20) as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
     
     print(f"📁 Interview session saved to: {filepath}")
     return filepath
 
 
 def load_interview_session(filepath: str) -> Dict[str, Any]:
-    """Load interview session from JSON file"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
-
-
-def _make_json_serializable(obj: Any) -> Any:
-    """Make an object JSON serializable"""
-    if isinstance(obj, dict):
-        return {key: _make_json_serializable(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [_make_json_serializable(item) for item in obj]
-    elif isinstance(obj, (str, int, float, bool)) or obj is None:
-        return obj
-    else:
-        return str(obj)
+    """Load interview session from JSON file.
+    
+    The file's JSON is read once until it changes; each call parses it into a fresh dict the caller may modify.
+    """
+    return orjson.loads(_read_session(filepath, os.stat(filepath).st_mtime_ns))
+
+
+@functools.lru_cache(maxsize=32)
+def _read_session(filepath: str, mtime_ns: int) -> bytes:
+    """JSON bytes of a session file, gzipped or not; keyed on its mtime so a rewritten file is read again"""
+    with open(filepath, 'rb') as f:
+        data = f.read()
+    if filepath.endswith('.gz'):
+        data = gzip.decompress(data)
+    return data
+
+
+def _coerce(obj: Any) -> str:
+    """JSON encoder fallback for values it can't serialize itself"""
+    return str(obj)
+
+
+class _NoteStats(NamedTuple):
+    """Aggregates over interview notes, gathered in a single pass by _aggregate"""
+    count: int
+    total: float
+    lowest: float
+    highest: float
+    score_counts: Counter
+    # category -> [question count, score total], in first-seen order
+    categories: Dict[str, List[float]]
+
+
+def _aggregate(interview_notes: List[Dict[str, Any]]) -> _NoteStats:
+    """Collect every statistic the summary needs in one pass over the (non-empty) notes"""
+    score_counts = Counter()
+    categories = defaultdict(lambda: [0, 0])
+    total = 0
+    lowest = highest = None
+    for note in interview_notes:
+        score = note.get('score', 0)
+        score_counts[score] += 1
+        total += score
+        if lowest is None or score < lowest:
+            lowest = score
+        if highest is None or score > highest:
+            highest = score
+        category = categories[note.get('question_category', 'general')]
+        category[0] += 1
+        category[1] += score
+    return _NoteStats(len(interview_notes), total, lowest, highest, score_counts, categories)
 
 
 def format_score_distribution(interview_notes: List[Dict[str, Any]]) -> str:
     """Format score distribution for display"""
     if not interview_notes:
         return "No scores available"
+    return _format_score_distribution(_aggregate(interview_notes))
+
+
+def _format_score_distribution(stats: _NoteStats) -> str:
+    """Score distribution from precomputed note statistics"""
+    parts = ["Score Distribution:\n"]
+    for score in sorted(stats.score_counts.keys(), reverse=True):
+        count = stats.score_counts[score]
+        bar = _BAR[:count] if count <= len(_BAR) else "█" * count
+        parts.append(f"{score}/10: {bar} ({count})\n")
     
-    scores = [note.get('score', 0) for note in interview_notes]
-    score_counts = {}
-    
-    for score in scores:
-        score_counts[score] = score_counts.get(score, 0) + 1
-    
-    result = "Score Distribution:\n"
-    for score in sorted(score_counts.keys(), reverse=True):
-        count = score_counts[score]
-        bar = "█" * count
-        result += f"{score}/10: {bar} ({count})\n"
-    
-    return result
+    return "".join(parts)
 
 
 def format_category_breakdown(interview_notes: List[Dict[str, Any]]) -> str:
     """Format category breakdown for display"""
     if not interview_notes:
         return "No categories available"
+    return _format_category_breakdown(_aggregate(interview_notes))
+
+
+def _format_category_breakdown(stats: _NoteStats) -> str:
+    """Category breakdown from precomputed note statistics"""
+    parts = ["Category Breakdown:\n"]
+    for category, (count, total_score) in stats.categories.items():
+        avg_score = total_score / count if count > 0 else 0
+        parts.append(f"{category.title()}: {count} questions, avg score: {avg_score:.1f}/10\n")
     
-    categories = {}
-    for note in interview_notes:
-        category = note.get('question_category', 'general')
-        if category not in categories:
-            categories[category] = {'count': 0, 'total_score': 0}
-        
-        categories[category]['count'] += 1
-        categories[category]['total_score'] += note.get('score', 0)
-    
-    result = "Category Breakdown:\n"
-    for category, data in categories.items():
-        avg_score = data['total_score'] / data['count'] if data['count'] > 0 else 0
-        result += f"{category.title()}: {data['count']} questions, avg score: {avg_score:.1f}/10\n"
-    
-    return result
+    return "".join(parts)
 
 
 def print_interview_summary(state: Dict[str, Any]) -> None:
     """Print a formatted interview summary"""
-    print("\n" + "="*60)
-    print("INTERVIEW SUMMARY")
-    print("="*60)
+    # Rendered into one buffer and written to stdout once
+    out = io.StringIO()
+    out.write(f"\n{'=' * 60}\nINTERVIEW SUMMARY\n{'=' * 60}\n")
     
     interview_notes = state.get('interview_notes', [])
     
     if not interview_notes:
-        print("No interview data available.")
-        return
-    
-    # Basic stats
-    total_questions = len(interview_notes)
-    scores = [note.get('score', 0) for note in interview_notes]
-    avg_score = sum(scores) / len(scores) if scores else 0
-    
-    print(f"Total Questions: {total_questions}")
-    print(f"Average Score: {avg_score:.1f}/10")
-    print(f"Highest Score: {max(scores) if scores else 0}/10")
-    print(f"Lowest Score: {min(scores) if scores else 0}/10")
+        out.write("No interview data available.\n")
+    else:
+        # Basic stats, distribution and categories all come from one pass over the notes
+        stats = _aggregate(interview_notes)
+        
+        out.write(f"Total Questions: {stats.count}\n")
+        out.write(f"Average Score: {stats.total / stats.count:.1f}/10\n")
+        out.write(f"Highest Score: {stats.highest}/10\n")
+        out.write(f"Lowest Score: {stats.lowest}/10\n")
+        
+        out.write(f"\n{_format_score_distribution(stats)}\n")
+        out.write(f"{_format_category_breakdown(stats)}\n")
     
-    print("\n" + format_score_distribution(interview_notes))
-    print(format_category_breakdown(interview_notes))
+    sys.stdout.write(out.getvalue())
 
 
 def export_report_to_file(report: str, output_dir: str = "./reports") -> str:
     """Export interview report to a text file"""
     os.makedirs(output_dir, exist_ok=True)
     
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    now = time.localtime()
+    timestamp = time.strftime("%Y%m%d_%H%M%S", now)
     filename = f"interview_report_{timestamp}.txt"
     filepath = os.path.join(output_dir, filename)
     
     with open(filepath, 'w', encoding='utf-8') as f:
-        f.write("INTERVIEW REPORT\n")
-        f.write("=" * 50 + "\n")
-        f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-        f.write(report)
+        f.write(
+            f"INTERVIEW REPORT\n{'=' * 50}\n"
+            f"Generated: {time.strftime('%Y-%m-%d %H:%M:%S', now)}\n\n{report}"
+        )
     
     print(f"📄 Report exported to: {filepath}")
     return filepath
@@ -140,35 +210,26 @@ def clean_old_files(directory: str, max_age_days: int = 30) -> None:
     if not os.path.exists(directory):
         return
     
-    current_time = datetime.now()
+    cutoff = time.time() - max_age_days * 86400
     deleted_count = 0
     
-    for filename in os.listdir(directory):
-        filepath = os.path.join(directory, filename)
-        
-        if os.path.isfile(filepath):
-            file_time = datetime.fromtimestamp(os.path.getctime(filepath))
-            age_days = (current_time - file_time).days
-            
-            if age_days > max_age_days:
-                os.remove(filepath)
-                deleted_count += 1
+    # scandir entries carry the file type and cache their stat, so each file costs one stat call
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if not entry.is_file(follow_symlinks=False):
+                continue
+            try:
+                if entry.stat().st_ctime < cutoff:
+                    os.unlink(entry.path)
+                    deleted_count += 1
+            except FileNotFoundError:
+                pass  # Already removed by someone else
     
     if deleted_count > 0:
         print(f"🧹 Cleaned {deleted_count} old files from {directory}")
 
 
 def validate_openai_key(api_key: str) -> bool:
-    """Basic validation for OpenAI API key format"""
-    if not api_key:
-        return False
-    
-    # Basic format check (OpenAI keys typically start with 'sk-')
-    if not api_key.startswith('sk-'):
-        return False
-    
-    # Check length (OpenAI keys are usually 51 characters)
-    if len(api_key) < 40:
-        return False
-    
-    return True
\ No newline at end of file
+    """Basic validation for OpenAI API key format (see _KEY_RE)"""
+    # Keys pasted with a trailing newline or space are still well-formed
+    return bool(api_key) and _KEY_RE.fullmatch(api_key.strip()) is not None
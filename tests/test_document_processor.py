@@ -0,0 +1,36 @@
+import random
+
+import pytest
+
+pytest.importorskip("fitz")
+text_splitter = pytest.importorskip("langchain.text_splitter")
+
+from src.components.document_processor import DocumentProcessor
+
+
+MULTI_PARAGRAPH = (
+    "Para one is here.\n\n"
+    "Para two sentence a. Para two sentence b continues for a while.\n\n"
+    "Third para.\nWith a second line that runs on long enough to need its own split."
+)
+
+
+def _random_text(rng: random.Random) -> str:
+    words = ["alpha", "beta", "gamma.", "delta,", "epsilon", "a", "unbrokenword" * 6]
+    return "".join(
+        rng.choice(words) + rng.choice([" ", " ", "  ", "\n", "\n\n"])
+        for _ in range(rng.randint(1, 300))
+    )
+
+
+@pytest.mark.parametrize("size,overlap", [(40, 0), (40, 10), (100, 20), (500, 50)])
+def test_fast_split_matches_recursive_splitter(size, overlap):
+    reference = text_splitter.RecursiveCharacterTextSplitter(chunk_size=size, chunk_overlap=overlap)
+    rng = random.Random(size * 1000 + overlap)
+    for text in [MULTI_PARAGRAPH, *(_random_text(rng) for _ in range(50))]:
+        assert DocumentProcessor._fast_split(text, size, overlap) == reference.split_text(text)
+
+
+def test_fast_split_prefers_paragraph_breaks():
+    chunks = DocumentProcessor._fast_split(MULTI_PARAGRAPH, 40, 0)
+    assert chunks[0] == "Para one is here."